@@ -1,9 +1,12 @@
 # Example snippet from the book - for reference only
-import re
+from guardrail_engine import GuardrailEngine
+
+# compiled once; substring match like the original (sql|drop|delete|update) regex
+INJECTION_GUARD = GuardrailEngine(terms=["sql", "drop", "delete", "update"], pii_patterns={})
 
 def validate_input(user_query: str):
     if len(user_query) > 500:
         raise ValueError("Input too long. Security policy triggered.")
-    if re.search(r"(sql|drop|delete|update)", user_query.lower()):
+    if INJECTION_GUARD.is_blocked(user_query):
         raise ValueError("Potential command injection detected.")
     return user_query
@@ -1,7 +1,10 @@
 # Example snippet from the book - for reference only
+from guardrail_engine import GuardrailEngine
+
+OUTPUT_GUARD = GuardrailEngine(terms=['violence', 'hate', 'self-harm'], pii_patterns={})
+
 def guard_output(response: str):
-    unsafe_terms = ['violence', 'hate', 'self-harm']
-    if any(term in response.lower() for term in unsafe_terms):
+    if OUTPUT_GUARD.is_blocked(response):
         return 'Unsafe response blocked.'
     return response
 
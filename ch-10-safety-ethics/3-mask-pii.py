@@ -8,4 +8,7 @@ def mask_pii(text):
 # Example usage
 text = "My phone number is 1234567890 and my email is test@example.com"
 masked = mask_pii(text)
-print(masked)
\ No newline at end of file
+print(masked)
+
+# For whole JSONL corpora / logs (parallel, order-preserving, with hit counts):
+#   python bulk_mask_pii.py input.jsonl masked.jsonl --workers 4
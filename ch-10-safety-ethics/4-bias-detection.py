@@ -5,4 +5,6 @@ def check_bias(sample_a, sample_b):
     else:
         print('Fair distribution.')
 
-check_bias([0.6, 0.7, 0.65], [0.9, 0.88, 0.87])
\ No newline at end of file
+check_bias([0.6, 0.7, 0.65], [0.9, 0.88, 0.87])
+
+# For many cohorts over a continuous stream of outcomes see bias_monitor.py
@@ -1,70 +1,47 @@
-from typing import TypedDict, Optional
+from pathlib import Path
+from typing import List, TypedDict, Optional
 from langgraph.graph import StateGraph, START, END
-import re
+from guardrail_engine import GuardrailEngine
+from guardrail_policy import load_policy, make_policy_node
 
 # -----------------------------------------
 # 1. Define State
 # -----------------------------------------
 class GuardrailState(TypedDict, total=False):
     response: str                    # The text to be checked / cleaned
-    guardrail_status: str            # "passed" | "blocked"
-    blocked_reason: Optional[str]    # Why it was blocked (if blocked)
-    pii_found: bool                  # Was any PII detected?
-    toxicity_flag: bool              # Was toxic content detected?
+    guardrail_status: str            # "passed" | "escalated" | "blocked"
+    blocked_reason: Optional[str]    # Policy rule that blocked it (if blocked)
+    policy_reason: Optional[str]     # Rule that blocked or escalated it
+    pii_found: bool                  # Was any PII detected (and masked)?
+    tools: List[str]                 # Tools the agent wants to call
+    sources: List[str]               # Sources the answer is grounded on
 
 
 # -----------------------------------------
-# 2. Config: Restricted Terms & Patterns
+# 2. Config: PII Patterns & Policy Rules
 # -----------------------------------------
-RESTRICTED_TERMS = {
-    "hate",
-    "violence",
-    "discrimination",
-}
-
 PHONE_REGEX = r"\b\d{10}\b"
 EMAIL_REGEX = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
 
+# PII masking only (compiled once at startup)
+MASKER = GuardrailEngine(
+    terms=(),
+    pii_patterns={"PHONE": PHONE_REGEX, "EMAIL": EMAIL_REGEX},
+)
 
-# -----------------------------------------
-# 3. Guardrail Node
-# -----------------------------------------
-def guardrail_node(state: GuardrailState) -> GuardrailState:
-    raw_response = state["response"]
-
-    # Flags for audit
-    toxicity = False
-    pii = False
-
-    # --- 3.1 Check for restricted / toxic content ---
-    if any(term in raw_response.lower() for term in RESTRICTED_TERMS):
-        toxicity = True
-        return {
-            "response": "Policy violation detected. Content blocked by guardrails.",
-            "guardrail_status": "blocked",
-            "blocked_reason": "restricted_terms",
-            "pii_found": False,
-            "toxicity_flag": True,
-        }
+# block / escalate decisions come from the rules in 6-nemo-guardrails.yaml
+# (toxicity, grounding, high-risk intent, allowed tools), see guardrail_policy.py
+POLICY = load_policy(str(Path(__file__).resolve().parent / "6-nemo-guardrails.yaml"))
 
-    # --- 3.2 Mask PII (phone, email) ---
-    masked = raw_response
 
-    if re.search(PHONE_REGEX, masked):
-        pii = True
-        masked = re.sub(PHONE_REGEX, "[PHONE]", masked)
-
-    if re.search(EMAIL_REGEX, masked):
-        pii = True
-        masked = re.sub(EMAIL_REGEX, "[EMAIL]", masked)
-
-    # --- 3.3 Return enriched state ---
+# -----------------------------------------
+# 3. Guardrail Nodes
+# -----------------------------------------
+def mask_node(state: GuardrailState) -> GuardrailState:
+    counts = dict.fromkeys(MASKER.labels, 0)
     return {
-        "response": masked,
-        "guardrail_status": "passed",
-        "blocked_reason": None,
-        "pii_found": pii,
-        "toxicity_flag": toxicity,
+        "response": MASKER.mask(state["response"], counts),
+        "pii_found": any(counts.values()),
     }
 
 
@@ -73,9 +50,12 @@ def guardrail_node(state: GuardrailState) -> GuardrailState:
 # -----------------------------------------
 graph = StateGraph(GuardrailState)
 
-graph.add_node("guardrails", guardrail_node)
-graph.add_edge(START, "guardrails")
-graph.add_edge("guardrails", END)
+# the policy sees the raw text (its PII rule needs it); masking runs after
+graph.add_node("policy", make_policy_node(POLICY, stage="output"))
+graph.add_node("mask_pii", mask_node)
+graph.add_edge(START, "policy")
+graph.add_edge("policy", "mask_pii")
+graph.add_edge("mask_pii", END)
 
 app = graph.compile()
 
@@ -83,17 +63,20 @@ app = graph.compile()
 # 5. Test Harness
 # -----------------------------------------
 test_inputs = [
-    "This contains hate and my email is abc@example.com",
-    "You can call me at 9876543210 for details.",
-    "Normal text, nothing sensitive here.",
+    ("This contains hate and my email is abc@example.com", {}),
+    ("You can call me at 9876543210 for details.", {}),
+    ("Normal text, nothing sensitive here.", {}),
+    ("You should buy this stock now.", {}),
+    ("You should buy this stock now.", {"sources": ["analyst_report.pdf"]}),
+    ("Please wire the funds today.", {"tools": ["db_lookup"]}),
+    ("Report sent.", {"tools": ["send_email"]}),
 ]
 
-for text in test_inputs:
-    result = app.invoke({"response": text})
-    print("INPUT :", text)
+for text, context in test_inputs:
+    result = app.invoke({"response": text, **context})
+    print("INPUT :", text, context or "")
     print("OUTPUT:", result["response"])
     print("STATUS:", result.get("guardrail_status"))
     print("PII   :", result.get("pii_found"))
-    print("TOXIC :", result.get("toxicity_flag"))
-    print("REASON:", result.get("blocked_reason"))
+    print("REASON:", result.get("policy_reason"))
     print("-" * 60)
@@ -0,0 +1,51 @@
+"""
+Benchmark – BiasMonitor ingest + all-pairs check at 1M+ outcomes
+
+Streams scored outcomes for a few hundred cohorts in batches and times
+the ingest and the vectorized violation check.
+
+Run:
+    python bench_bias_monitor.py               # 5M outcomes, 300 cohorts
+    python bench_bias_monitor.py 20000000 500
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from bias_monitor import BiasMonitor
+
+BATCH = 100_000
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    n_cohorts = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    rng = np.random.default_rng(7)
+
+    # cohort base rates around 0.7; a few cohorts are deliberately skewed
+    base = rng.normal(0.7, 0.03, n_cohorts).clip(0.05, 0.95)
+    base[:5] *= 0.7
+    labels = np.array([f"cohort_{c}" for c in range(n_cohorts)])
+
+    monitor = BiasMonitor()
+    ingest_s = 0.0
+    for _ in range(total // BATCH):
+        cohort = rng.integers(0, n_cohorts, BATCH)
+        scores = (rng.random(BATCH) < base[cohort]).astype(np.float64)
+        batch_labels = labels[cohort]
+
+        start = time.perf_counter()
+        monitor.ingest(batch_labels, scores)
+        ingest_s += time.perf_counter() - start
+
+    start = time.perf_counter()
+    i, j, ratio = monitor.violations()
+    check_s = time.perf_counter() - start
+
+    pairs = n_cohorts * (n_cohorts - 1) // 2
+    print(f"outcomes      : {int(monitor.counts.sum()):,} across {n_cohorts} cohorts")
+    print(f"ingest        : {ingest_s:.2f}s ({total / ingest_s:,.0f} outcomes/s)")
+    print(f"all-pairs     : {check_s * 1e3:.1f} ms for {pairs:,} pairs")
+    print(f"violations    : {len(ratio):,}")
+    print("worst pairs   :", monitor.report(limit=3))
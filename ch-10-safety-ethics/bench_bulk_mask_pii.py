@@ -0,0 +1,61 @@
+"""
+Benchmark – bulk PII masking throughput (records/s) vs. worker count
+
+Generates a synthetic agent log (same shape as ch-9 agent_logs.jsonl, with
+PII in the query/response fields) and runs bulk_mask_jsonl at several
+worker counts.
+
+Run:
+    python bench_bulk_mask_pii.py            # 200k records
+    python bench_bulk_mask_pii.py 1000000    # 1M records
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from bulk_mask_pii import bulk_mask_jsonl
+
+
+def write_synthetic_log(path: str, n: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        for i in range(n):
+            query = "Summarize report for client"
+            if rng.random() < 0.2:
+                query += f" user{i}@example.com"
+            response = "Revenue grew 20% this quarter."
+            if rng.random() < 0.2:
+                response += f" Call {rng.randrange(10**9, 10**10)} for details."
+            f.write(json.dumps({
+                "timestamp": 1763227811.128711 + i,
+                "query": query,
+                "response": response,
+                "latency": round(rng.uniform(0.1, 0.5), 3),
+                "drift_score": round(rng.random() * 0.2, 3),
+            }) + "\n")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "logs.jsonl")
+        dst = os.path.join(tmp, "masked.jsonl")
+        write_synthetic_log(src, n)
+
+        print(f"{n:,} records, {cpus} CPUs")
+        print(f"{'workers':>7} | {'seconds':>8} | {'records/s':>10}")
+        print("-" * 32)
+        for workers in worker_counts:
+            start = time.perf_counter()
+            stats = bulk_mask_jsonl(src, dst, workers=workers)
+            elapsed = time.perf_counter() - start
+            assert stats["records"] == n
+            print(f"{workers:>7} | {elapsed:>8.2f} | {n / elapsed:>10,.0f}")
+        print("hits:", {k: v for k, v in stats.items() if k != "records"})
@@ -0,0 +1,92 @@
+"""
+Benchmark – legacy guardrail_node vs. GuardrailEngine
+
+Compares the original multi-pass guardrail (lower() + `in` per term +
+re.search/re.sub per PII pattern) with the compiled engine (one term scan
++ one PII scan) on synthetic responses from 1 KB to 100 KB.
+
+Run:
+    python bench_guardrail_engine.py
+"""
+
+import random
+import re
+import time
+
+from guardrail_engine import GuardrailEngine
+
+RESTRICTED_TERMS = {"hate", "violence", "discrimination"}
+PHONE_REGEX = r"\b\d{10}\b"
+EMAIL_REGEX = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
+
+SIZES_KB = [1, 10, 100]
+BATCH = 200
+
+
+# ----------------------------------------------------
+# 1. Baseline: the original 7-minilab.py node logic
+# ----------------------------------------------------
+def legacy_guardrail(text: str):
+    if any(term in text.lower() for term in RESTRICTED_TERMS):
+        return "blocked", None
+    masked = text
+    if re.search(PHONE_REGEX, masked):
+        masked = re.sub(PHONE_REGEX, "[PHONE]", masked)
+    if re.search(EMAIL_REGEX, masked):
+        masked = re.sub(EMAIL_REGEX, "[EMAIL]", masked)
+    return "passed", masked
+
+
+# ----------------------------------------------------
+# 2. Synthetic responses (clean text with scattered PII)
+# ----------------------------------------------------
+WORDS = (
+    "the agent reviewed quarterly revenue growth market summary portfolio "
+    "risk profile client retrieval context answer model report"
+).split()
+
+
+def make_response(size_bytes: int, rng: random.Random) -> str:
+    out, n = [], 0
+    while n < size_bytes:
+        r = rng.random()
+        if r < 0.01:
+            w = str(rng.randrange(10**9, 10**10))
+        elif r < 0.02:
+            w = f"user{rng.randrange(1000)}@example.com"
+        else:
+            w = rng.choice(WORDS)
+        out.append(w)
+        n += len(w) + 1
+    return " ".join(out)
+
+
+def timed(fn, texts) -> float:
+    start = time.perf_counter()
+    fn(texts)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    rng = random.Random(7)
+    engine = GuardrailEngine(
+        terms=RESTRICTED_TERMS,
+        pii_patterns={"PHONE": PHONE_REGEX, "EMAIL": EMAIL_REGEX},
+    )
+
+    print(f"{'size':>7} | {'legacy ms/resp':>14} | {'engine ms/resp':>14} | speedup")
+    print("-" * 56)
+    for kb in SIZES_KB:
+        batch = BATCH if kb < 100 else BATCH // 10
+        texts = [make_response(kb * 1024, rng) for _ in range(batch)]
+
+        # sanity: both produce the same masked text
+        for t in texts[:5]:
+            assert legacy_guardrail(t)[1] == engine.scan(t)["text"]
+
+        legacy = timed(lambda ts: [legacy_guardrail(t) for t in ts], texts)
+        fast = timed(engine.scan_many, texts)
+        print(
+            f"{kb:>5}KB | {legacy / batch * 1e3:>14.3f} | "
+            f"{fast / batch * 1e3:>14.3f} | {legacy / fast:>6.2f}x"
+        )
@@ -0,0 +1,142 @@
+"""
+Bias Monitor – incremental, vectorized disparate-impact tracking
+
+check_bias() in 4-bias-detection.py compares the means of two Python lists.
+In production we track hundreds of cohorts over a continuous stream of
+scored outcomes, so BiasMonitor:
+
+1. Keeps per-cohort running count / sum / sum of squares in NumPy arrays
+   (no raw samples are stored)
+2. Ingests a whole batch with np.bincount (one call per statistic)
+3. Checks EVERY cohort pair against the 0.8 – 1.25 ratio band in one
+   vectorized step and returns only the violating pairs
+
+Usage:
+    monitor = BiasMonitor()
+    monitor.ingest(["group_a", "group_b", ...], [0.61, 0.90, ...])
+    for v in monitor.report():
+        print(v)
+"""
+
+from typing import Dict, Hashable, List, Sequence, TypedDict
+
+import numpy as np
+
+
+class Violation(TypedDict):
+    cohort_a: Hashable
+    cohort_b: Hashable
+    ratio: float          # mean(cohort_a) / mean(cohort_b)
+    count_a: int
+    count_b: int
+
+
+class BiasMonitor:
+    """Running per-cohort statistics + all-pairs disparate-impact check."""
+
+    def __init__(self, low: float = 0.8, high: float = 1.25, min_count: int = 30,
+                 capacity: int = 64):
+        self.low = low
+        self.high = high
+        self.min_count = min_count       # ignore cohorts with too few samples
+
+        self.cohorts: List[Hashable] = []
+        self._ids: Dict[Hashable, int] = {}
+        self.counts = np.zeros(capacity, dtype=np.int64)
+        self.sums = np.zeros(capacity, dtype=np.float64)
+        self.sumsq = np.zeros(capacity, dtype=np.float64)
+
+    # ---------- cohort ids ----------
+    def _cohort_ids(self, labels: Sequence[Hashable]) -> np.ndarray:
+        """Map labels -> dense int ids (dict lookup once per *unique* label)."""
+        uniques, inverse = np.unique(np.asarray(labels), return_inverse=True)
+        lookup = np.empty(len(uniques), dtype=np.int64)
+        for i, label in enumerate(uniques.tolist()):
+            cid = self._ids.get(label)
+            if cid is None:
+                cid = self._ids[label] = len(self.cohorts)
+                self.cohorts.append(label)
+            lookup[i] = cid
+        self._reserve(len(self.cohorts))
+        return lookup[inverse.ravel()]
+
+    def _reserve(self, n: int) -> None:
+        if n <= len(self.counts):
+            return
+        size = max(n, 2 * len(self.counts))
+        for name in ("counts", "sums", "sumsq"):
+            old = getattr(self, name)
+            grown = np.zeros(size, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+    # ---------- ingest ----------
+    def ingest(self, labels: Sequence[Hashable], scores: Sequence[float]) -> None:
+        """Add a batch of (cohort label, score) outcomes."""
+        ids = self._cohort_ids(labels)
+        self.ingest_ids(ids, scores)
+
+    def ingest_ids(self, ids: np.ndarray, scores: Sequence[float]) -> None:
+        """Fast path when cohorts are already dense ints (see cohort_id())."""
+        scores = np.asarray(scores, dtype=np.float64)
+        n = len(self.counts)
+        self.counts += np.bincount(ids, minlength=n)
+        self.sums += np.bincount(ids, weights=scores, minlength=n)
+        self.sumsq += np.bincount(ids, weights=scores * scores, minlength=n)
+
+    def cohort_id(self, label: Hashable) -> int:
+        return int(self._cohort_ids([label])[0])
+
+    # ---------- statistics ----------
+    def means(self) -> np.ndarray:
+        k = len(self.cohorts)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.sums[:k] / self.counts[:k]
+
+    def stds(self) -> np.ndarray:
+        k = len(self.cohorts)
+        mean = self.means()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var = self.sumsq[:k] / self.counts[:k] - mean * mean
+        return np.sqrt(np.maximum(var, 0.0))
+
+    def violations(self):
+        """Vectorized all-pairs check; returns (i, j, ratio) arrays for i < j."""
+        k = len(self.cohorts)
+        means = self.means()
+        eligible = self.counts[:k] >= self.min_count
+
+        i, j = np.triu_indices(k, k=1)
+        keep = eligible[i] & eligible[j]
+        i, j = i[keep], j[keep]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = means[i] / means[j]
+        # nan (0/0) never violates; inf (x/0) always does
+        bad = (ratio < self.low) | (ratio > self.high)
+        return i[bad], j[bad], ratio[bad]
+
+    def report(self, limit: int = 20) -> List[Violation]:
+        """Worst violating pairs first (furthest from a ratio of 1)."""
+        i, j, ratio = self.violations()
+        with np.errstate(divide="ignore"):
+            order = np.argsort(-np.abs(np.log(ratio)))[:limit]
+        return [
+            {
+                "cohort_a": self.cohorts[i[n]],
+                "cohort_b": self.cohorts[j[n]],
+                "ratio": round(float(ratio[n]), 4),
+                "count_a": int(self.counts[i[n]]),
+                "count_b": int(self.counts[j[n]]),
+            }
+            for n in order
+        ]
+
+
+if __name__ == "__main__":
+    # same data as 4-bias-detection.py, as a stream of labelled outcomes
+    monitor = BiasMonitor(min_count=1)
+    monitor.ingest(["a", "a", "a"], [0.6, 0.7, 0.65])
+    monitor.ingest(["b", "b", "b"], [0.9, 0.88, 0.87])
+    print("means:", dict(zip(monitor.cohorts, monitor.means().round(3).tolist())))
+    print("Potential bias detected." if monitor.report() else "Fair distribution.")
+    print(monitor.report())
@@ -0,0 +1,134 @@
+"""
+Bulk PII Masking – scrub large JSONL corpora / logs before retention
+
+mask_pii() in 3-mask-pii.py handles one string at a time. This module masks
+millions of records (e.g. ch-9 agent_logs.jsonl, exported audit trails):
+
+1. Streams the JSONL input line by line (never loads the whole file)
+2. Groups lines into chunks and masks them across a process pool
+3. Keeps a bounded number of chunks in flight and writes them back
+   in input order
+4. Masks string values and integer values (a phone number stored as a
+   number is still PII; a hit turns it into a masked string). Floats -
+   timestamps, latencies, scores - are left as they are and counted as
+   "numbers_skipped" in the report
+5. Reports per-pattern hit counts (also written next to the output)
+
+Run:
+    python bulk_mask_pii.py ../ch-9-run-monitor-maintain/agent_logs.jsonl masked.jsonl --workers 4
+"""
+
+import argparse
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from guardrail_engine import PII_PATTERNS, GuardrailEngine
+
+# PII-only engine (no restricted terms), compiled once per process
+MASKER = GuardrailEngine(terms=(), pii_patterns=PII_PATTERNS)
+
+
+# ----------------------------------------------------
+# 1. Per-record / per-chunk masking (runs in workers)
+# ----------------------------------------------------
+def mask_value(value, counts: Dict[str, int]):
+    """Recursively mask every string / integer inside a decoded JSON value."""
+    if isinstance(value, str):
+        return MASKER.mask(value, counts)
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int):
+        text = str(value)
+        masked = MASKER.mask(text, counts)
+        return value if masked == text else masked
+    if isinstance(value, float):
+        counts["numbers_skipped"] += 1
+        return value
+    if isinstance(value, dict):
+        return {k: mask_value(v, counts) for k, v in value.items()}
+    if isinstance(value, list):
+        return [mask_value(v, counts) for v in value]
+    return value
+
+
+def mask_chunk(lines: List[str]) -> Tuple[List[str], Dict[str, int]]:
+    """Mask a chunk of JSONL lines; return masked lines + hit counts."""
+    counts = dict.fromkeys([*MASKER.labels, "numbers_skipped"], 0)
+    out = []
+    for line in lines:
+        if not line.strip():
+            continue
+        record = mask_value(json.loads(line), counts)
+        out.append(json.dumps(record, ensure_ascii=False))
+    return out, counts
+
+
+# ----------------------------------------------------
+# 2. Ordered, bounded parallel map
+# ----------------------------------------------------
+def iter_chunks(lines: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    it = iter(lines)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def ordered_map(fn, chunks: Iterable, workers: int, max_in_flight: int) -> Iterator:
+    """Like executor.map, but reads input lazily (bounded memory)."""
+    if workers <= 1:
+        yield from map(fn, chunks)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight: deque = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(fn, chunk))
+            if len(in_flight) >= max_in_flight:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+# ----------------------------------------------------
+# 3. File-level pipeline
+# ----------------------------------------------------
+def bulk_mask_jsonl(
+    src: str,
+    dst: str,
+    workers: Optional[int] = None,
+    chunk_size: int = 2000,
+) -> Dict[str, int]:
+    """Mask src JSONL into dst (same record order); return totals."""
+    workers = workers or os.cpu_count() or 1
+    totals = dict.fromkeys([*MASKER.labels, "numbers_skipped", "records"], 0)
+
+    with open(src, encoding="utf-8") as fin, open(dst, "w", encoding="utf-8") as fout:
+        results = ordered_map(mask_chunk, iter_chunks(fin, chunk_size), workers, workers * 4)
+        for lines, counts in results:
+            if lines:
+                fout.write("\n".join(lines))
+                fout.write("\n")
+            totals["records"] += len(lines)
+            for label, n in counts.items():
+                totals[label] += n
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mask PII in a JSONL file.")
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    stats = bulk_mask_jsonl(args.src, args.dst, args.workers, args.chunk_size)
+    with open(args.dst + ".stats.json", "w") as f:
+        json.dump(stats, f, indent=2)
+    print(json.dumps(stats, indent=2))
@@ -0,0 +1,195 @@
+"""
+Guardrail Engine – compiled restricted-term + PII scanner
+
+The book snippets (1-security.py, 2-guard-output.py, 7-minilab.py) each
+re-scan the same text several times: lower() the whole string, loop over the
+restricted terms with `in`, then re.search + re.sub once per PII pattern.
+
+GuardrailEngine compiles everything ONCE at startup:
+- restricted terms are folded into a prefix trie and emitted as a single
+  regex (the Aho-Corasick idea expressed in the `re` engine), so one scan
+  covers every term no matter how many there are
+- all PII patterns become named groups of one alternation behind a shared
+  token-start assertion, so one scan finds and masks every PII kind
+
+Note: terms and PII are deliberately two scans, not one. Python's `re` is a
+backtracking engine; a single alternation of terms + PII tries every branch
+at every character and is slower than two tight scans. Measured on
+bench_guardrail_engine.py's responses (one pass = `(?i:terms)|PII` plus a
+term check inside each PII match, same results):
+
+    size     two scans   one pass
+    1 KB     0.075 ms    0.16 ms
+    10 KB    0.71 ms     1.11 ms
+    100 KB   5.4 ms      15.7 ms
+
+Usage:
+    engine = GuardrailEngine()
+    result = engine.scan("Call me at 9876543210")
+    result["text"]      -> "Call me at [PHONE]"
+    result["blocked"]   -> False
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, TypedDict
+
+# ----------------------------------------------------
+# 1. Default policy (the original 7-minilab.py terms; the minilab now
+#    applies them through guardrail_policy.py's toxicity signal)
+# ----------------------------------------------------
+RESTRICTED_TERMS = {
+    "hate",
+    "violence",
+    "discrimination",
+}
+
+PII_PATTERNS = {
+    "PHONE": r"\b\d{10}\b",
+    "EMAIL": r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
+}
+
+# PII never starts in the middle of a word: reject those positions once,
+# before trying any pattern (this is where most of the speed-up comes from)
+PII_BOUNDARY = r"(?<![a-zA-Z0-9_])"
+
+
+class ScanResult(TypedDict):
+    text: str                        # masked text ("" when blocked)
+    blocked: bool                    # restricted term found?
+    blocked_reason: Optional[str]    # "restricted_terms" | None
+    matched_term: Optional[str]      # first restricted term hit
+    pii_counts: Dict[str, int]       # hits per PII label
+
+
+# ----------------------------------------------------
+# 2. Trie -> regex
+# ----------------------------------------------------
+def trie_regex(terms: Iterable[str]) -> str:
+    """Build a prefix-factored alternation, e.g. {"hate", "harm"} -> h(?:arm|ate)."""
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end-of-term marker
+
+    def build(node: dict) -> str:
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        if "" in node:
+            # a shorter term already ended here; the rest is optional
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+# ----------------------------------------------------
+# 3. Engine
+# ----------------------------------------------------
+class GuardrailEngine:
+    """Compiled-once guardrail: block on restricted terms, mask PII."""
+
+    def __init__(
+        self,
+        terms: Iterable[str] = RESTRICTED_TERMS,
+        pii_patterns: Dict[str, str] = PII_PATTERNS,
+        pii_boundary: str = PII_BOUNDARY,
+    ):
+        terms = sorted({t.lower() for t in terms if t})
+        self.terms = terms
+        self.labels = list(pii_patterns)
+
+        # terms are matched on text.lower(): a case-sensitive regex keeps
+        # the literal-prefix fast path that re.IGNORECASE disables
+        self._term_re = re.compile(trie_regex(terms)) if terms else None
+
+        if pii_patterns:
+            alternation = "|".join(f"(?P<{label}>{p})" for label, p in pii_patterns.items())
+            self._pii_re = re.compile(f"{pii_boundary}(?:{alternation})")
+        else:
+            self._pii_re = None
+
+    # ---------- building blocks ----------
+    def find_term(self, text: str) -> Optional[str]:
+        """First restricted term in text (substring, case-insensitive) or None."""
+        if self._term_re is None:
+            return None
+        m = self._term_re.search(text.lower())
+        return m.group() if m else None
+
+    def is_blocked(self, text: str) -> bool:
+        return self.find_term(text) is not None
+
+    def mask(self, text: str, counts: Optional[Dict[str, int]] = None) -> str:
+        """Replace every PII match with [LABEL]; add hits to counts if given."""
+        if self._pii_re is None:
+            return text
+        return self.mask_matches(text, self._pii_re.finditer(text), counts)
+
+    def pii_matches(self, text: str, pos: int = 0) -> List[re.Match]:
+        """PII matches in text[pos:]; text[:pos] only serves as lookbehind context."""
+        if self._pii_re is None:
+            return []
+        return list(self._pii_re.finditer(text, pos))
+
+    @staticmethod
+    def mask_matches(text: str, matches: Iterable[re.Match], counts: Optional[Dict[str, int]] = None,
+                     start: int = 0, end: Optional[int] = None) -> str:
+        """text[start:end] with the given matches (inside that span) replaced by [LABEL]."""
+        end = len(text) if end is None else end
+        pieces: List[str] = []
+        last = start
+        for m in matches:
+            label = m.lastgroup
+            if counts is not None:
+                counts[label] = counts.get(label, 0) + 1
+            pieces.append(text[last:m.start()])
+            pieces.append(f"[{label}]")
+            last = m.end()
+
+        if not pieces:
+            return text[start:end] if start or end != len(text) else text
+        pieces.append(text[last:end])
+        return "".join(pieces)
+
+    # ---------- single text ----------
+    def scan(self, text: str) -> ScanResult:
+        """Return the block decision and the masked text together."""
+        counts = dict.fromkeys(self.labels, 0)
+        term = self.find_term(text)
+        if term is not None:
+            # blocked text is never shown, so skip the masking scan
+            return _result("", term, counts)
+        return _result(self.mask(text, counts), None, counts)
+
+    # ---------- batch ----------
+    def scan_many(self, texts: Iterable[str]) -> List[ScanResult]:
+        """Scan a batch of responses with the same compiled engine."""
+        scan = self.scan
+        return [scan(t) for t in texts]
+
+
+def _result(text: str, term: Optional[str], counts: Dict[str, int]) -> ScanResult:
+    return {
+        "text": text,
+        "blocked": term is not None,
+        "blocked_reason": "restricted_terms" if term is not None else None,
+        "matched_term": term,
+        "pii_counts": counts,
+    }
+
+
+# shared default instance, compiled once at import
+DEFAULT_ENGINE = GuardrailEngine()
+
+
+if __name__ == "__main__":
+    for sample in [
+        "This contains hate and my email is abc@example.com",
+        "You can call me at 9876543210 for details.",
+        "Normal text, nothing sensitive here.",
+    ]:
+        print(sample, "->", DEFAULT_ENGINE.scan(sample))
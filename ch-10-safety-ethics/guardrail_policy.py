@@ -0,0 +1,312 @@
+"""
+Guardrail Policy – compile the YAML guardrail files into one evaluator
+
+6-nemo-guardrails.yaml (rule DSL) and ch-8 6-guardrails.yaml (input/output
+rails) describe policy, but nothing executes them. This module turns them
+into a single evaluator:
+
+1. Each rule is parsed ONCE into a predicate over named *signals*
+   (toxicity, contains_sensitive_pii, user_intent, ...)
+2. Every signal has an estimated cost; rules are sorted cheapest-first
+   per stage at load time
+3. Evaluation stops at the first "block"
+4. Signal values are memoized per request, so rules that share a signal
+   (e.g. two toxicity thresholds) pay for it once
+
+Supported DSL lines (inside `define guardrails:`):
+    block if <signal> [<op> <literal>]
+    escalate if <signal> [<op> <literal>]
+    require grounding for <signal>
+    restrict tools to ["tool_a", "tool_b"]
+
+Usage:
+    policy = load_policy("6-nemo-guardrails.yaml", "../ch-8-nvidia-platform/6-guardrails.yaml")
+    policy.evaluate("some model output", stage="output", tools=["db_lookup"])
+    graph.add_node("policy", make_policy_node(policy, stage="output"))
+"""
+
+import ast
+import operator
+import re
+import warnings
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypedDict
+
+import yaml
+
+from guardrail_engine import DEFAULT_ENGINE, PII_PATTERNS, GuardrailEngine
+
+PII_ONLY = GuardrailEngine(terms=(), pii_patterns=PII_PATTERNS)
+
+
+class Decision(TypedDict):
+    action: str                 # "allow" | "block" | "escalate"
+    reason: Optional[str]       # source rule text of the deciding rule
+    escalations: List[str]      # escalate rules that fired
+    signals: Dict[str, Any]     # signal values computed for this request
+
+
+# ----------------------------------------------------
+# 1. Signals: name -> (function(request) -> value, estimated cost)
+# ----------------------------------------------------
+# Costs are relative (1 ~ one regex scan). Replace the heuristic signals
+# with real classifiers via register_signal(); give them a realistic cost.
+SIGNALS: Dict[str, Tuple[Callable[["Request"], Any], float]] = {}
+
+
+def register_signal(name: str, cost: float):
+    """Decorator: add or replace a signal used by policy rules."""
+    def wrap(fn):
+        SIGNALS[name] = (fn, cost)
+        return fn
+    return wrap
+
+
+HIGH_RISK_WORDS = re.compile(r"\b(?:wire|transfer|withdraw|password|override|bypass)\b", re.I)
+FINANCE_WORDS = re.compile(r"\b(?:invest|stock|portfolio|buy|sell|returns?)\b", re.I)
+
+
+@register_signal("grounded", cost=0)
+def _grounded(req: "Request") -> bool:
+    return bool(req.context.get("sources"))
+
+
+@register_signal("contains_sensitive_pii", cost=1)
+def _contains_pii(req: "Request") -> bool:
+    counts = dict.fromkeys(PII_ONLY.labels, 0)
+    PII_ONLY.mask(req.text, counts)
+    return any(counts.values())
+
+
+@register_signal("financial_advice", cost=2)
+def _financial_advice(req: "Request") -> bool:
+    return FINANCE_WORDS.search(req.text) is not None
+
+
+@register_signal("toxicity", cost=10)
+def _toxicity(req: "Request") -> float:
+    # stand-in for a toxicity model: restricted term -> 1.0
+    return 1.0 if DEFAULT_ENGINE.is_blocked(req.text) else 0.0
+
+
+@register_signal("user_intent", cost=50)
+def _user_intent(req: "Request") -> str:
+    # stand-in for an intent classifier (LLM call in production)
+    return "high_risk" if HIGH_RISK_WORDS.search(req.text) else "normal"
+
+
+class Request:
+    """One evaluation: text + context, with memoized signal values."""
+
+    def __init__(self, text: str, stage: str, context: Dict[str, Any]):
+        self.text = text
+        self.stage = stage
+        self.context = context
+        self.values: Dict[str, Any] = {}
+
+    def signal(self, name: str):
+        if name not in self.values:
+            fn, _ = SIGNALS[name]
+            self.values[name] = fn(self)
+        return self.values[name]
+
+
+# ----------------------------------------------------
+# 2. Rule compilation
+# ----------------------------------------------------
+OPS = {
+    ">": operator.gt, ">=": operator.ge,
+    "<": operator.lt, "<=": operator.le,
+    "==": operator.eq, "!=": operator.ne,
+}
+
+CONDITION = re.compile(r"^(?P<name>\w+)\s*(?:(?P<op>>=|<=|==|!=|>|<)\s*(?P<value>.+))?$")
+RULE_FORMS = [
+    ("block", re.compile(r"^block if (?P<cond>.+)$")),
+    ("escalate", re.compile(r"^escalate if (?P<cond>.+)$")),
+    ("ground", re.compile(r"^require grounding for (?P<topic>\w+)$")),
+    ("tools", re.compile(r"^restrict tools to (?P<tools>\[.*\])$")),
+]
+
+
+class Rule:
+    def __init__(self, source: str, action: str, signals: Tuple[str, ...],
+                 test: Callable[[Request], bool], stages: Tuple[str, ...]):
+        self.source = source
+        self.action = action      # "block" | "escalate"
+        self.signals = signals
+        self.test = test
+        self.stages = stages
+
+    @property
+    def cost(self) -> float:
+        return sum(SIGNALS[s][1] for s in self.signals)
+
+    def __repr__(self):
+        return f"Rule({self.source!r}, cost={self.cost})"
+
+
+def _compile_condition(cond: str) -> Tuple[Tuple[str, ...], Callable[[Request], bool]]:
+    m = CONDITION.match(cond.strip())
+    if not m:
+        raise ValueError(f"Unsupported guardrail condition: {cond!r}")
+    name, op = m.group("name"), m.group("op")
+    if name not in SIGNALS:
+        raise ValueError(f"Unknown guardrail signal: {name!r}")
+    if op is None:
+        return (name,), lambda req: bool(req.signal(name))
+    compare, value = OPS[op], ast.literal_eval(m.group("value").strip())
+    return (name,), lambda req: compare(req.signal(name), value)
+
+
+def compile_rule(line: str, stages: Tuple[str, ...] = ("input", "output")) -> Rule:
+    """Parse one DSL line into a Rule."""
+    line = line.strip()
+    for kind, pattern in RULE_FORMS:
+        m = pattern.match(line)
+        if not m:
+            continue
+        if kind in ("block", "escalate"):
+            signals, test = _compile_condition(m.group("cond"))
+            return Rule(line, kind, signals, test, stages)
+        if kind == "ground":
+            topic = m.group("topic")
+            if topic not in SIGNALS:
+                raise ValueError(f"Unknown guardrail signal: {topic!r}")
+            return Rule(
+                line, "block", (topic, "grounded"),
+                lambda req: bool(req.signal(topic)) and not req.signal("grounded"),
+                ("output",),
+            )
+        allowed = frozenset(ast.literal_eval(m.group("tools")))
+        return Rule(
+            line, "block", (),
+            lambda req: not allowed.issuperset(req.context.get("tools", ())),
+            stages,
+        )
+    raise ValueError(f"Unsupported guardrail rule: {line!r}")
+
+
+# NeMo-style rail names (ch-8 6-guardrails.yaml) expressed in the same DSL.
+# Rails with no signal behind them (e.g. enforce_company_policy, which stands
+# for a whole policy file) are not guessed at: load that file instead.
+RAIL_LIBRARY = {
+    "ensure_no_personal_data": "block if contains_sensitive_pii",
+    "ban_toxicity": "block if toxicity > 0.6",
+}
+
+
+# ----------------------------------------------------
+# 3. Evaluator
+# ----------------------------------------------------
+class PolicyEvaluator:
+    """Cost-ordered, short-circuiting evaluator over compiled rules."""
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules = list(rules)
+        self._by_stage: Dict[str, List[Rule]] = {}
+        for stage in ("input", "output"):
+            # identical rules from several files are evaluated once
+            staged = list({r.source: r for r in self.rules if stage in r.stages}.values())
+            # cheapest first; blocks before escalations at equal cost
+            staged.sort(key=lambda r: (r.cost, r.action != "block"))
+            self._by_stage[stage] = staged
+
+    def evaluate(self, text: str, stage: str = "output", **context) -> Decision:
+        req = Request(text, stage, context)
+        escalations: List[str] = []
+        for rule in self._by_stage[stage]:
+            if not rule.test(req):
+                continue
+            if rule.action == "block":
+                return {"action": "block", "reason": rule.source,
+                        "escalations": escalations, "signals": req.values}
+            escalations.append(rule.source)
+        return {
+            "action": "escalate" if escalations else "allow",
+            "reason": escalations[0] if escalations else None,
+            "escalations": escalations,
+            "signals": req.values,
+        }
+
+
+def parse_policy_file(path: str) -> List[Rule]:
+    """Read either the rule DSL or a NeMo-style `rails:` YAML file."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+
+    rules: List[Rule] = []
+    if "define guardrails:" in text:
+        # plain YAML folds the DSL lines into one string; read them line by line
+        body = text.split("define guardrails:", 1)[1]
+        for line in body.splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                rules.append(compile_rule(line))
+        return rules
+
+    rails = (yaml.safe_load(text) or {}).get("rails", {})
+    for stage in ("input", "output"):
+        for name in rails.get(stage, []) or []:
+            if name not in RAIL_LIBRARY:
+                warnings.warn(f"No rule for rail {name!r} in {path}; skipped", stacklevel=3)
+                continue
+            rules.append(compile_rule(RAIL_LIBRARY[name], stages=(stage,)))
+    return rules
+
+
+def load_policy(*paths: str) -> PolicyEvaluator:
+    rules: List[Rule] = []
+    for path in paths:
+        rules.extend(parse_policy_file(path))
+    return PolicyEvaluator(rules)
+
+
+# ----------------------------------------------------
+# 4. LangGraph node factory
+# ----------------------------------------------------
+def make_policy_node(policy: PolicyEvaluator, stage: str = "output", field: str = "response"):
+    """Node for a GuardrailState-style graph (see 7-minilab.py).
+
+    Run it on the raw text (before any PII masking), or PII rules never fire.
+    `policy_reason` is the deciding rule of a block or an escalation.
+    """
+    def policy_node(state: dict) -> dict:
+        decision = policy.evaluate(
+            state[field], stage=stage,
+            tools=state.get("tools", ()), sources=state.get("sources", ()),
+        )
+        if decision["action"] == "block":
+            return {
+                field: "Policy violation detected. Content blocked by guardrails.",
+                "guardrail_status": "blocked",
+                "blocked_reason": decision["reason"],
+                "policy_reason": decision["reason"],
+            }
+        return {
+            "guardrail_status": "escalated" if decision["action"] == "escalate" else "passed",
+            "blocked_reason": None,
+            "policy_reason": decision["reason"],
+        }
+    return policy_node
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+
+    here = Path(__file__).resolve().parent
+    policy = load_policy(
+        str(here / "6-nemo-guardrails.yaml"),
+        str(here.parent / "ch-8-nvidia-platform" / "6-guardrails.yaml"),
+    )
+    for stage in ("input", "output"):
+        print(stage, "order:", [r.source for r in policy._by_stage[stage]])
+
+    samples = [
+        ("Please wire the funds today", {"tools": ["db_lookup"]}),
+        ("You should buy this stock now", {"tools": []}),
+        ("Reach me at 9876543210", {"tools": []}),
+        ("Status looks fine", {"tools": ["send_email"]}),
+        ("Status looks fine", {"tools": ["fraud_check"]}),
+    ]
+    for text, ctx in samples:
+        print(text, ctx, "->", policy.evaluate(text, stage="output", **ctx))
@@ -0,0 +1,161 @@
+"""
+Streaming Guardrail – incremental filter for llm.stream() chunks
+
+GuardrailEngine.scan() needs the complete response. For token streams we
+want to show text as it arrives, so StreamingGuardrail keeps only a small
+lookback buffer:
+
+- the current (unfinished) word is held back, so a phone number, email or
+  restricted term split across chunks ("98765" + "43210") is still caught
+- the last few already-emitted characters are kept, so multi-word terms
+  that span the emit point are still detected (and PII boundaries such as
+  `\b` see the same neighbour as in the full text)
+- everything before the held word is masked and emitted immediately
+- a word longer than `max_lookback` (compact JSON, base64, ...) is cut,
+  but never inside a PII match: the buffer is scanned once and the cut
+  backs up to the start of any match it would split, so the streamed
+  output equals engine.mask(full_text)
+
+Added latency is at most one word; memory is bounded by `max_lookback`
+plus one PII match. (PII longer than `max_lookback` can still be split.)
+
+Once a restricted term completes, the stream is cut and BLOCK_MESSAGE is
+emitted instead. Text already shown cannot be taken back, but the term
+itself never is.
+
+Usage:
+    guard = StreamingGuardrail()
+    for chunk in llm.stream(prompt):
+        print(guard.feed(chunk.content), end="", flush=True)
+        if guard.blocked:
+            break
+    print(guard.close())
+"""
+
+from typing import Dict, Iterable, Iterator, Optional
+
+from guardrail_engine import DEFAULT_ENGINE, GuardrailEngine
+
+BLOCK_MESSAGE = "\n[Policy violation detected. Content blocked by guardrails.]"
+
+
+class StreamingGuardrail:
+    """Consume chunks one by one; emit masked text with a bounded lookback."""
+
+    def __init__(
+        self,
+        engine: GuardrailEngine = DEFAULT_ENGINE,
+        max_lookback: int = 256,
+        block_message: str = BLOCK_MESSAGE,
+    ):
+        self.engine = engine
+        self.block_message = block_message
+        # chars a term may reach back into already-emitted text; at least one
+        # so the PII lookbehind / \b sees the character before the buffer
+        self._term_overlap = max((len(t) for t in engine.terms), default=1) - 1
+        self._tail_len = max(self._term_overlap, 1)
+        self.max_lookback = max(max_lookback, self._term_overlap + 1)
+
+        self._pending = ""       # received, not yet emitted (raw)
+        self._emitted_tail = ""  # last emitted raw chars: term checks, PII context
+
+        self.blocked = False
+        self.blocked_reason: Optional[str] = None
+        self.matched_term: Optional[str] = None
+        self.pii_counts: Dict[str, int] = dict.fromkeys(engine.labels, 0)
+
+    # ---------- core ----------
+    def feed(self, chunk: str) -> str:
+        """Add a chunk; return the text that is safe to show now."""
+        if self.blocked or not chunk:
+            return ""
+        self._pending += chunk
+        if self._check_terms():
+            return self.block_message
+        return self._emit(final=False)
+
+    def close(self) -> str:
+        """End of stream: flush whatever is still held back."""
+        if self.blocked or not self._pending:
+            return ""
+        if self._check_terms():
+            return self.block_message
+        return self._emit(final=True)
+
+    def guard(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Wrap an iterable of text chunks; stops consuming once blocked."""
+        for chunk in chunks:
+            out = self.feed(chunk)
+            if out:
+                yield out
+            if self.blocked:
+                return
+        out = self.close()
+        if out:
+            yield out
+
+    # ---------- helpers ----------
+    def _check_terms(self) -> bool:
+        term = self.engine.find_term(self._emitted_tail + self._pending)
+        if term is None:
+            return False
+        self.blocked = True
+        self.blocked_reason = "restricted_terms"
+        self.matched_term = term
+        self._pending = ""
+        return True
+
+    def _safe_cut(self, text: str, start: int, matches) -> int:
+        """Emit up to the last whitespace; PII never spans whitespace."""
+        cut = len(text)
+        while cut > start and not text[cut - 1].isspace():
+            cut -= 1
+        # one very long "word": force progress but keep the buffer bounded,
+        # without splitting a PII match (matches don't overlap: one at most)
+        if len(text) - cut > self.max_lookback:
+            cut = len(text) - self.max_lookback
+            for m in matches:
+                if m.start() < cut < m.end():
+                    cut = m.start()
+                    break
+        return cut
+
+    def _emit(self, final: bool) -> str:
+        # one scan over tail + buffer; the tail is context, never re-emitted
+        start = len(self._emitted_tail)
+        text = self._emitted_tail + self._pending
+        matches = self.engine.pii_matches(text, start)
+        cut = len(text) if final else self._safe_cut(text, start, matches)
+        if cut <= start:
+            return ""
+        out = self.engine.mask_matches(text, [m for m in matches if m.end() <= cut], self.pii_counts, start, cut)
+        self._pending = text[cut:]
+        self._emitted_tail = text[:cut][-self._tail_len:]
+        return out
+
+
+def guard_stream(chunks: Iterable[str], engine: GuardrailEngine = DEFAULT_ENGINE) -> Iterator[str]:
+    """Functional shortcut: yield guarded text for a stream of chunks."""
+    return StreamingGuardrail(engine).guard(chunks)
+
+
+if __name__ == "__main__":
+    chunks = ["Call me at 98765", "43210 or mail ab", "c@exam", "ple.com. Thanks!"]
+    print("".join(guard_stream(chunks)))
+
+    chunks = ["Some intro text. This is ha", "te speech", " and more."]
+    print("".join(guard_stream(chunks)))
+
+    # self-check: compact JSON (no whitespace, longer than max_lookback) must
+    # stream to exactly what masking the whole text gives, for any chunking
+    import json
+
+    records = [{"id": i, "phone": str(9876543200 + i), "mail": f"user{i}@example.com"} for i in range(12)]
+    text = json.dumps(records, separators=(",", ":"))
+    expected = DEFAULT_ENGINE.mask(text)
+    for size in range(1, 41):
+        for lookback in (16, 64, 256):
+            guard = StreamingGuardrail(max_lookback=lookback)
+            streamed = "".join(guard.guard(text[i:i + size] for i in range(0, len(text), size)))
+            assert streamed == expected, (size, lookback)
+    print(f"streamed == mask(full text) for {len(text)} chars, chunk sizes 1-40")
@@ -7,3 +7,5 @@ def explain_prediction(features, weights):
     print('Total Influence:', total)
 
 explain_prediction(['age', 'income', 'loan_amount'], [0.2, 0.5, 0.3])
+
+# For batches of predictions (audit trail volume) see attribution.py
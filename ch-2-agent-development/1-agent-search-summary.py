@@ -11,6 +11,11 @@ Requires:
 - GOOGLE_API_KEY in a .env file
 """
 
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "ch-7-deployment" / "minilab"))
+
 import os
 from typing import Annotated, TypedDict
 
@@ -19,7 +24,7 @@ from wikipedia import summary as wiki_summary
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import MemorySaver
 from langchain_core.prompts import PromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
+from llm_factory import make_chat_model
 
 # ----------------------------------------------------
 # 1. Load env + model
@@ -27,7 +32,7 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 load_dotenv()
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
-gemini = ChatGoogleGenerativeAI(
+gemini = make_chat_model(
     model="gemini-2.5-flash",
     google_api_key=GOOGLE_API_KEY,
     temperature=0.3,
@@ -1,11 +1,19 @@
 # react-agent.py
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "ch-7-deployment" / "minilab"))
+
 import os
-from typing import TypedDict, List
+from typing import Annotated, TypedDict
 from langgraph.graph import StateGraph, START, END
-from langchain_core.messages import AnyMessage, ToolMessage, HumanMessage, AIMessage
+from langchain_core.messages import HumanMessage, AIMessage
 from langchain_core.tools import tool
-from langchain_google_genai import ChatGoogleGenerativeAI
+from llm_factory import make_chat_model
 from dotenv import load_dotenv
+from tool_cache import FOREVER, ToolCache
+from tool_executor import ToolExecutor
+from message_log import MessageLog, append_messages
 load_dotenv()
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
@@ -19,12 +27,22 @@ TOOLS = {
     "calculate_area": calculate_area,
 }
 
+# opt-in result cache: pure tools never expire; give network tools a
+# short TTL, e.g. "fetch_stock_price": 60
+TOOL_CACHE = ToolCache(ttls={"calculate_area": FOREVER}, max_size=1024)
+
+# runs a turn's tool calls concurrently (threads for sync tools,
+# ainvoke for async tools), each with a timeout, results in call order
+TOOL_EXECUTOR = ToolExecutor(TOOLS, timeout=30.0, cache=TOOL_CACHE)
+
 # 2) Define state
+# append-only history: nodes return only their NEW messages and the
+# reducer appends them in O(1) instead of copying the whole list
 class AgentState(TypedDict):
-    messages: List[AnyMessage]
+    messages: Annotated[MessageLog, append_messages]
 
 # 3) LLM
-llm = ChatGoogleGenerativeAI(
+llm = make_chat_model(
     model="gemini-2.5-flash",
     google_api_key=GOOGLE_API_KEY,
     temperature=0.3,
@@ -37,30 +55,17 @@ def agent_node(state: AgentState) -> AgentState:
     If LLM decides to call a tool, it will emit a tool-call message.
     """
     resp = llm.invoke(state["messages"], tools=list(TOOLS.values()))
-    return {"messages": state["messages"] + [resp]}
+    return {"messages": [resp]}
 
 # 5) Node: run tools (if any tool calls are present)
 def tool_node(state: AgentState) -> AgentState:
     last = state["messages"][-1]
     tool_calls = getattr(last, "tool_calls", None)
 
-    new_messages: List[AnyMessage] = state["messages"][:]
-
-    if tool_calls:
-        for call in tool_calls:
-            name = call["name"]
-            args = call["args"]
-            tool_fn = TOOLS[name]
-            result = tool_fn.invoke(args)
-            new_messages.append(
-                ToolMessage(
-                    name=name,
-                    content=str(result),
-                    tool_call_id=call["id"],
-                )
-            )
-
-    return {"messages": new_messages}
+    if not tool_calls:
+        return {"messages": []}
+
+    return {"messages": TOOL_EXECUTOR.run(tool_calls)}
 
 # 6) Conditional: do we need to go back to agent or finish?
 def should_continue(state: AgentState) -> str:
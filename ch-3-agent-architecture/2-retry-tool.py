@@ -1,5 +1,6 @@
 from typing import TypedDict
 from langgraph.graph import StateGraph, START, END
+from retry_node import RetryPolicy, with_retry, retry_metrics
 
 # 1) shared state
 class State(TypedDict, total=False):
@@ -7,51 +8,55 @@ class State(TypedDict, total=False):
     message: str
     status: str  # "ok" or "error"
 
-# 2) node that MAY fail, but we catch it inside
+# 2) node that MAY fail – it just raises, the retry wrapper handles it.
+#    The wrapper retries with the same state, so the attempt count of the
+#    simulated tool lives here and run() resets it for every run
+calls = {"n": 0}
+
 def risky_step(state: State) -> State:
-    attempts = state.get("attempts", 0) + 1
-
-    try:
-        # simulate flaky tool
-        if attempts < 3:
-            raise Exception(f"Simulated failure on attempt {attempts}")
-        # success path
-        return {
-            "attempts": attempts,
-            "message": "Task succeeded after retries ",
-            "status": "ok",
-        }
-    except Exception as e:
-        # soft-fail: return state instead of raising
-        return {
-            "attempts": attempts,
-            "message": str(e),
-            "status": "error",
-        }
-
-# 3) router: where do we go next?
-def decide_next(state: State) -> str:
-    # retry up to 3 attempts
-    if state.get("status") == "error" and state.get("attempts", 0) < 3:
-        return "risky"   # go back and try again
-    return "end"         # stop the workflow
-
-# 4) build graph
+    calls["n"] += 1
+    attempts = calls["n"]
+
+    # simulate flaky tool
+    if attempts < 3:
+        raise Exception(f"Simulated failure on attempt {attempts}")
+    # success path
+    return {
+        "attempts": attempts,
+        "message": "Task succeeded after retries ",
+        "status": "ok",
+    }
+
+# 3) soft-fail: turn the final error into state instead of raising
+def give_up(state: State, error: Exception) -> State:
+    return {
+        "attempts": calls["n"],
+        "message": str(error),
+        "status": "error",
+    }
+
+# 4) build graph – retries, backoff + jitter and the circuit breaker
+#    live in the wrapper, so no retry edge is needed
 graph = StateGraph(State)
-graph.add_node("risky", risky_step)
-graph.add_edge(START, "risky")
-
-graph.add_conditional_edges(
+graph.add_node(
     "risky",
-    decide_next,
-    {
-        "risky": "risky",
-        "end": END,
-    },
+    with_retry(
+        risky_step,
+        dependency="flaky_tool",
+        policy=RetryPolicy(max_attempts=3, base_delay=0.05),
+        on_failure=give_up,
+    ),
 )
+graph.add_edge(START, "risky")
+graph.add_edge("risky", END)
 
 app = graph.compile()
 
-# 5) run once
-result = app.invoke({"attempts": 0, "message": "", "status": "ok"})
-print(result)
+# 5) run – every run starts with a fresh flaky tool
+def run(state: State) -> State:
+    calls["n"] = 0
+    return app.invoke(state)
+
+for _ in range(2):
+    print(run({"attempts": 0, "message": "", "status": "ok"}))
+print(retry_metrics())
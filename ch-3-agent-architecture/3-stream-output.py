@@ -1,13 +1,21 @@
+import sys
+from pathlib import Path
+
+# guardrails from chapter 10, model factory from chapter 7
+sys.path.append(str(Path(__file__).resolve().parent.parent / "ch-10-safety-ethics"))
+sys.path.append(str(Path(__file__).resolve().parent.parent / "ch-7-deployment" / "minilab"))
+
 from langgraph.graph import StateGraph, START, END
-from langchain_google_genai import ChatGoogleGenerativeAI
 import os
 from dotenv import load_dotenv
 load_dotenv()
 from typing import TypedDict, List
+from guardrail_stream import StreamingGuardrail
+from llm_factory import make_chat_model
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
-llm = ChatGoogleGenerativeAI(
+llm = make_chat_model(
     model="gemini-2.5-flash",
     google_api_key=GOOGLE_API_KEY,
     temperature=0.3,
@@ -21,11 +29,15 @@ graph = StateGraph(ConversationState)
 def talk(state: ConversationState) -> ConversationState:
     user_messages = state["messages"]
 
-    # stream from LLM and print live
+    # stream from LLM and print live, through the streaming guardrail
+    # (masks PII / blocks restricted terms, holding back at most one word)
+    guard = StreamingGuardrail()
     for chunk in llm.stream(user_messages[-1]):
-        print(chunk.content, end="", flush=True)
+        print(guard.feed(chunk.content), end="", flush=True)
+        if guard.blocked:
+            break  # stop consuming tokens once blocked
 
-    print()  # newline after stream
+    print(guard.close())  # flush held-back text + newline after stream
     # you can append the last user msg to history
     return state
 
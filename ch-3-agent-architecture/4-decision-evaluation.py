@@ -1,11 +1,16 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "ch-7-deployment" / "minilab"))
+
 import os
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+from llm_factory import make_chat_model
 
 load_dotenv()
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
-llm = ChatGoogleGenerativeAI(
+llm = make_chat_model(
     model="gemini-2.5-flash",
     google_api_key=GOOGLE_API_KEY,
     temperature=0.3,
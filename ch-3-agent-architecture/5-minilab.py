@@ -2,18 +2,25 @@
 # Get a free API key here: https://www.alphavantage.co/support/#api-key
 # Add your Google API key to .env as GOOGLE_API_KEY
 
-import requests
-from typing import TypedDict, Optional
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "ch-7-deployment" / "minilab"))
+
+import operator
+from typing import Annotated, TypedDict, Optional, List
 from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
 import os
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+from llm_factory import llm_backend, make_chat_model
+from market_data import ALPHA_VANTAGE_URL, MarketDataClient
 
 load_dotenv()
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
 # LLM for summarization
-llm = ChatGoogleGenerativeAI(
+llm = make_chat_model(
     model="gemini-2.5-flash",
     google_api_key=GOOGLE_API_KEY,
     temperature=0.3,
@@ -30,20 +37,21 @@ class AgentState(TypedDict, total=False):
 # replace with your own Alpha Vantage key
 alpha_vantage_api_key = "api-key-here"
 
+# shared client: pooled keep-alive connections, 30s quote cache,
+# concurrent callers for the same symbol share one upstream request
+# (set ALPHA_VANTAGE_URL to point at market_data_stub.py for offline runs)
+market_data = MarketDataClient(
+    alpha_vantage_api_key,
+    base_url=os.getenv("ALPHA_VANTAGE_URL", ALPHA_VANTAGE_URL),
+    ttl=30,
+)
+
 # 1) Fetch stock price from Alpha Vantage
 def fetch_stock_node(state: AgentState) -> AgentState:
     symbol = state.get("symbol", "AAPL")
-    url = (
-        "https://www.alphavantage.co/query"
-        f"?function=GLOBAL_QUOTE&symbol={symbol}&apikey={alpha_vantage_api_key}"
-    )
     try:
-        data = requests.get(url, timeout=10).json()
-        price = data.get("Global Quote", {}).get("05. price", None)
-        if price:
-            state["stock_raw"] = f"{symbol.upper()} current price: ${price}"
-        else:
-            raise ValueError("No price found in API response")
+        price = market_data.price(symbol)
+        state["stock_raw"] = f"{symbol.upper()} current price: ${price}"
     except Exception as e:
         # fallback so lab always works
         state["stock_raw"] = f"{symbol.upper()} current price: $190.75 (sample)"
@@ -59,7 +67,7 @@ def summarize_node(state: AgentState) -> AgentState:
         f"Stock info: {stock_info}"
     )
     try:
-        if GOOGLE_API_KEY:
+        if GOOGLE_API_KEY or llm_backend() == "fake":
             res = llm.invoke(prompt)
             # langchain-google-genai returns an object with .content
             state["summary"] = res.content if hasattr(res, "content") else str(res)
@@ -105,9 +113,88 @@ graph.add_edge("reflect", END)
 
 app = graph.compile()
 
+# ---------------------------------------------------------------
+# 6) Portfolio variant: fan-out per symbol, fan-in to one report
+# ---------------------------------------------------------------
+# fetch + summarize run per symbol in parallel (at most MAX_CONCURRENCY
+# at a time); results are merged into ONE report with ONE reflection.
+# A failing symbol becomes a partial result instead of failing the run.
+MAX_CONCURRENCY = 8
+
+class SymbolResult(TypedDict, total=False):
+    index: int
+    symbol: str
+    stock_raw: str
+    summary: str
+    error: Optional[str]
+
+class PortfolioState(TypedDict, total=False):
+    symbols: List[str]
+    results: Annotated[List[SymbolResult], operator.add]  # fan-in
+    final_answer: str
+    reflection: str
+
+def fan_out(state: PortfolioState):
+    return [
+        Send("symbol_worker", {"index": i, "symbol": s.upper()})
+        for i, s in enumerate(state.get("symbols", []))
+    ]
+
+def symbol_worker(task: SymbolResult) -> PortfolioState:
+    item: SymbolResult = {"index": task["index"], "symbol": task["symbol"]}
+    try:
+        price = market_data.price(task["symbol"])
+        item["stock_raw"] = f"{task['symbol']} current price: ${price}"
+        summarized = summarize_node({"stock_raw": item["stock_raw"]})
+        item["summary"] = summarized["summary"]
+        if summarized.get("error"):
+            item["error"] = summarized["error"].lstrip(" |")
+    except Exception as e:
+        item["error"] = f"fetch failed: {e}"
+    return {"results": [item]}
+
+def compose_report_node(state: PortfolioState) -> PortfolioState:
+    results = sorted(state.get("results", []), key=lambda r: r["index"])
+    lines = []
+    for r in results:
+        if r.get("stock_raw"):
+            lines.append(f"{r['stock_raw']}\n  {r.get('summary', '')}")
+    failed = [f"{r['symbol']}: {r['error']}" for r in results if not r.get("stock_raw")]
+    report = "Portfolio market summary:\n\n" + "\n\n".join(lines)
+    if failed:
+        report += "\n\nUnavailable:\n" + "\n".join(failed)
+    return {"final_answer": report}
+
+def portfolio_reflection_node(state: PortfolioState) -> PortfolioState:
+    results = state.get("results", [])
+    done = sum(1 for r in results if r.get("stock_raw") and not r.get("error"))
+    total = len(state.get("symbols", []))
+    if done == total:
+        return {"reflection": f"Report covers all {total} symbols ✅"}
+    return {"reflection": f"Report is partial: {done}/{total} symbols complete ❗"}
+
+def build_portfolio_graph():
+    g = StateGraph(PortfolioState)
+    g.add_node("symbol_worker", symbol_worker)
+    g.add_node("compose", compose_report_node)
+    g.add_node("reflect", portfolio_reflection_node)
+
+    g.add_conditional_edges(START, fan_out, ["symbol_worker"])
+    g.add_edge("symbol_worker", "compose")
+    g.add_edge("compose", "reflect")
+    g.add_edge("reflect", END)
+    return g.compile().with_config(max_concurrency=MAX_CONCURRENCY)
+
+portfolio_app = build_portfolio_graph()
+
 if __name__ == "__main__":
     result = app.invoke({"symbol": "AAPL"})
     print(result.get("final_answer", ""))
     print(result.get("reflection", ""))
     if result.get("error"):
         print("Note:", result["error"])
+
+    print("\n" + "=" * 60 + "\n")
+    result = portfolio_app.invoke({"symbols": ["AAPL", "MSFT", "NVDA"]})
+    print(result.get("final_answer", ""))
+    print(result.get("reflection", ""))
@@ -0,0 +1,86 @@
+"""
+Benchmark – per-step cost vs. history length in a ReAct-style loop
+
+Runs a two-node loop (agent -> tools -> agent ...) with no LLM, so only the
+graph + state handling is measured. Compares:
+- copy      : the original pattern (state["messages"] + [msg], [:] copies)
+- add_msgs  : LangGraph's add_messages reducer
+- msg_log   : MessageLog + append_messages (append-only, shared)
+
+Run:
+    python bench_message_log.py          # 2,000 messages
+    python bench_message_log.py 5000
+"""
+
+import sys
+import time
+from typing import Annotated, List, TypedDict
+
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, ToolMessage
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+from message_log import MessageLog, append_messages
+
+
+def build(kind: str, target: int, timings: list):
+    if kind == "copy":
+        class S(TypedDict):
+            messages: List[AnyMessage]
+    elif kind == "add_msgs":
+        class S(TypedDict):
+            messages: Annotated[List[AnyMessage], add_messages]
+    else:
+        class S(TypedDict):
+            messages: Annotated[MessageLog, append_messages]
+
+    def agent(state):
+        timings.append(time.perf_counter())
+        n = len(state["messages"])
+        msg = AIMessage(content=f"step {n}", tool_calls=[
+            {"name": "noop", "args": {}, "id": f"call-{n}"}
+        ])
+        if kind == "copy":
+            return {"messages": state["messages"] + [msg]}
+        return {"messages": [msg]}
+
+    def tools(state):
+        last = state["messages"][-1]
+        msg = ToolMessage(content="ok", tool_call_id=last.tool_calls[0]["id"])
+        if kind == "copy":
+            new = state["messages"][:]
+            new.append(msg)
+            return {"messages": new}
+        return {"messages": [msg]}
+
+    def route(state):
+        return "tools" if len(state["messages"]) < target else "end"
+
+    g = StateGraph(S)
+    g.add_node("agent", agent)
+    g.add_node("tools", tools)
+    g.add_edge(START, "agent")
+    g.add_conditional_edges("agent", route, {"tools": "tools", "end": END})
+    g.add_edge("tools", "agent")
+    return g.compile()
+
+
+if __name__ == "__main__":
+    target = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    buckets = [b for b in (250, 500, 1000, 2000, 5000, 10000) if b <= target]
+
+    print(f"per-step time (us) at history length; {target:,} messages total")
+    print(f"{'kind':>9} | " + " | ".join(f"{b:>7}" for b in buckets) + " | total s")
+    for kind in ("copy", "add_msgs", "msg_log"):
+        timings: list = []
+        app = build(kind, target, timings)
+        start = time.perf_counter()
+        app.invoke({"messages": [HumanMessage(content="go")]}, {"recursion_limit": target + 10})
+        total = time.perf_counter() - start
+        # one agent step = 2 messages; average a window of steps per bucket
+        cols = []
+        for b in buckets:
+            i = min(b // 2, len(timings) - 1)
+            lo = max(1, i - 25)
+            cols.append((timings[i] - timings[lo]) / (i - lo) * 1e6)
+        print(f"{kind:>9} | " + " | ".join(f"{c:>7.0f}" for c in cols) + f" | {total:.2f}")
@@ -0,0 +1,151 @@
+"""
+Market Data Client – pooled, concurrent, cached Alpha Vantage quotes
+
+fetch_stock_node in 5-minilab.py calls `requests.get` (no session) for one
+symbol per graph run: every call pays a fresh TCP/TLS handshake and the
+same quote is fetched again and again. MarketDataClient:
+
+- keeps ONE requests.Session with a sized connection pool (keep-alive)
+- fetches many symbols concurrently on a thread pool (get_quotes)
+- caches quotes for a short TTL, in an LRU bounded by `max_size`
+  (expired quotes are dropped when read, the least recently used when full)
+- collapses concurrent requests for the same symbol into one upstream
+  call (single-flight)
+- raises RateLimitError when the API says so (HTTP 429 or the Alpha Vantage
+  "Note"/"Information" payload), so callers can back off (see retry_node.py)
+
+Try it offline against the local stub (market_data_stub.py):
+    python market_data_stub.py
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+ALPHA_VANTAGE_URL = "https://www.alphavantage.co/query"
+
+
+class RateLimitError(RuntimeError):
+    """Upstream rejected the request because of its rate limit."""
+
+
+class QuoteError(RuntimeError):
+    """Upstream answered, but without a usable quote."""
+
+
+class MarketDataClient:
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = ALPHA_VANTAGE_URL,
+        ttl: float = 30.0,
+        pool_size: int = 16,
+        max_workers: int = 8,
+        timeout: float = 10.0,
+        max_size: int = 1024,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_size = max_size
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="quotes")
+
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()  # symbol -> (expires, quote), LRU order
+        self._inflight: Dict[str, Future] = {}   # symbol -> pending upstream call
+        self._lock = threading.Lock()
+        self.stats = dict.fromkeys(["upstream_calls", "cache_hits", "coalesced", "rate_limited"], 0)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    # ---------- upstream ----------
+    def _fetch(self, symbol: str) -> dict:
+        self._count("upstream_calls")
+        resp = self.session.get(
+            self.base_url,
+            params={"function": "GLOBAL_QUOTE", "symbol": symbol, "apikey": self.api_key},
+            timeout=self.timeout,
+        )
+        if resp.status_code == 429:
+            self._count("rate_limited")
+            raise RateLimitError(f"HTTP 429 for {symbol}")
+        resp.raise_for_status()
+        data = resp.json()
+        if "Note" in data or "Information" in data:
+            # Alpha Vantage signals throttling with HTTP 200 + a message
+            self._count("rate_limited")
+            raise RateLimitError(data.get("Note") or data.get("Information"))
+        quote = data.get("Global Quote") or {}
+        if not quote.get("05. price"):
+            raise QuoteError(f"No price found in API response for {symbol}")
+        return quote
+
+    # ---------- public API ----------
+    def get_quote(self, symbol: str) -> dict:
+        """Cached, single-flight quote lookup for one symbol."""
+        symbol = symbol.upper()
+        with self._lock:
+            entry = self._cache.get(symbol)
+            if entry is not None and entry[0] > time.monotonic():
+                self._cache.move_to_end(symbol)
+                self.stats["cache_hits"] += 1
+                return entry[1]
+            if entry is not None:
+                del self._cache[symbol]  # expired
+            pending = self._inflight.get(symbol)
+            if pending is None:
+                pending = self._inflight[symbol] = Future()
+                leader = True
+            else:
+                self.stats["coalesced"] += 1
+                leader = False
+
+        if not leader:
+            return pending.result()
+
+        try:
+            quote = self._fetch(symbol)
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        else:
+            pending.set_result(quote)
+            with self._lock:
+                self._cache[symbol] = (time.monotonic() + self.ttl, quote)
+                self._cache.move_to_end(symbol)
+                while len(self._cache) > self.max_size:
+                    self._cache.popitem(last=False)
+            return quote
+        finally:
+            with self._lock:
+                self._inflight.pop(symbol, None)
+
+    def get_quotes(self, symbols: Iterable[str]) -> Dict[str, Union[dict, Exception]]:
+        """Fetch many symbols concurrently; failures come back as exceptions."""
+        futures = {s.upper(): self._pool.submit(self.get_quote, s) for s in symbols}
+        results: Dict[str, Union[dict, Exception]] = {}
+        for symbol, fut in futures.items():
+            try:
+                results[symbol] = fut.result()
+            except Exception as e:
+                results[symbol] = e
+        return results
+
+    def price(self, symbol: str) -> Optional[str]:
+        return self.get_quote(symbol).get("05. price")
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
+        self.session.close()
@@ -0,0 +1,107 @@
+"""
+Local Alpha Vantage stub – test MarketDataClient without network or API key
+
+Serves GLOBAL_QUOTE responses on localhost with:
+- simulated latency per request
+- a simulated rate limit (requests per second); over the limit it answers
+  like Alpha Vantage does (HTTP 200 + "Note"), or HTTP 429 if asked
+- deterministic prices per symbol
+
+Run the demo / benchmark (naive requests.get vs. MarketDataClient):
+    python market_data_stub.py
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def start_stub_server(latency: float = 0.05, rate_limit: int = 0, use_429: bool = False):
+    """Start the stub on a free port in a daemon thread; return (server, url)."""
+    window: deque = deque()
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+        def do_GET(self):
+            server.request_count += 1
+            params = parse_qs(urlparse(self.path).query)
+            symbol = params.get("symbol", ["?"])[0].upper()
+
+            limited = False
+            if rate_limit:
+                now = time.monotonic()
+                with lock:
+                    while window and now - window[0] > 1.0:
+                        window.popleft()
+                    limited = len(window) >= rate_limit
+                    if not limited:
+                        window.append(now)
+
+            time.sleep(latency)
+            if limited and use_429:
+                return self._send(429, {"error": "Too Many Requests"})
+            if limited:
+                return self._send(200, {"Note": "Thank you for using Alpha Vantage! (stub rate limit)"})
+
+            cents = int(hashlib.md5(symbol.encode()).hexdigest()[:6], 16) % 50000 + 1000
+            self._send(200, {"Global Quote": {"01. symbol": symbol, "05. price": f"{cents / 100:.4f}"}})
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.request_count = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/query"
+
+
+if __name__ == "__main__":
+    import requests
+
+    from market_data import MarketDataClient
+
+    symbols = [f"SYM{i}" for i in range(40)]
+    server, url = start_stub_server(latency=0.05)
+
+    # 1) naive: one requests.get per symbol, sequential, no session
+    start = time.perf_counter()
+    for s in symbols:
+        requests.get(url, params={"function": "GLOBAL_QUOTE", "symbol": s, "apikey": "demo"}, timeout=10).json()
+    naive = time.perf_counter() - start
+
+    # 2) client: pooled + concurrent, then a second pass from cache
+    client = MarketDataClient("demo", base_url=url, ttl=30, max_workers=16)
+    start = time.perf_counter()
+    client.get_quotes(symbols)
+    pooled = time.perf_counter() - start
+    start = time.perf_counter()
+    client.get_quotes(symbols + symbols)  # duplicates + cache hits
+    cached = time.perf_counter() - start
+
+    print(f"naive sequential : {naive:.2f}s for {len(symbols)} symbols")
+    print(f"pooled concurrent: {pooled:.2f}s")
+    print(f"cached re-fetch  : {cached * 1e3:.1f} ms")
+    print("client stats     :", client.stats, "| stub requests:", server.request_count)
+
+    # 3) single-flight + rate limit: 20 callers ask for the same symbol at once
+    server2, url2 = start_stub_server(latency=0.1, rate_limit=5)
+    client2 = MarketDataClient("demo", base_url=url2, ttl=0.0)
+    client2.get_quotes(["AAPL"] * 20)
+    print("single-flight    :", client2.stats, "| stub requests:", server2.request_count)
+    results = client2.get_quotes(symbols[:10])
+    print("rate limited     :", sum(isinstance(r, Exception) for r in results.values()), "of 10")
@@ -0,0 +1,98 @@
+"""
+Message Log – append-only, structurally shared message history
+
+In 1-react-agent.py, agent_node returns `state["messages"] + [resp]` and
+tool_node copies the list again with `state["messages"][:]`: every step is
+O(n) in history length, so a long tool-using session is O(n^2).
+(LangGraph's built-in `add_messages` reducer also copies the list and
+re-indexes all ids on every step.)
+
+MessageLog is an immutable *view* over a shared backing list:
+- appending at the tail extends the backing list in place and returns a
+  new, longer view -> O(1) per new message
+- older views keep their own length, so earlier snapshots never change
+- appending to an older view (a branch) copies the prefix once
+  (copy-on-write)
+
+Use it as a LangGraph channel with the append_messages reducer; nodes then
+return ONLY their new messages:
+
+    class AgentState(TypedDict):
+        messages: Annotated[MessageLog, append_messages]
+
+    def agent_node(state):
+        return {"messages": [resp]}
+
+With a checkpointer, allow-list the type for LangGraph's serializer:
+    JsonPlusSerializer(allowed_msgpack_modules=[("message_log", "MessageLog")])
+"""
+
+from collections.abc import Sequence
+from typing import Any, Iterable, Iterator
+
+
+class MessageLog(Sequence):
+    __slots__ = ("_items", "_len")
+
+    def __init__(self, items: Iterable[Any] = ()):
+        self._items = list(items)
+        self._len = len(self._items)
+
+    @classmethod
+    def _view(cls, items: list, length: int) -> "MessageLog":
+        log = cls.__new__(cls)
+        log._items = items
+        log._len = length
+        return log
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._items[: self._len][index]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("MessageLog index out of range")
+        return self._items[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        items = self._items
+        for i in range(self._len):
+            yield items[i]
+
+    def __repr__(self) -> str:
+        return f"MessageLog({self._items[: self._len]!r})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (MessageLog, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __reduce__(self):
+        # pickling sees a plain snapshot of this view
+        return (MessageLog, (list(self),))
+
+    def _asdict(self) -> dict:
+        # LangGraph's msgpack serde rebuilds this as MessageLog(items=[...])
+        return {"items": list(self)}
+
+    def extend(self, new: Iterable[Any]) -> "MessageLog":
+        """Return a longer view; O(len(new)) when self is the newest view."""
+        items = self._items
+        if self._len != len(items):
+            items = items[: self._len]  # branching from an older snapshot
+        items.extend(new)
+        return MessageLog._view(items, len(items))
+
+
+def append_messages(left, right) -> MessageLog:
+    """LangGraph reducer: append new message(s) without copying history."""
+    if not isinstance(left, MessageLog):
+        left = MessageLog(left or ())  # first step: copy the input once
+    if isinstance(right, MessageLog):
+        right = list(right)
+    elif not isinstance(right, list):
+        right = [right]
+    return left.extend(right)
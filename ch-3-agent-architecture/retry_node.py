@@ -0,0 +1,277 @@
+"""
+Retry Node – backoff + jitter + retry budget + circuit breaker for any node
+
+2-retry-tool.py loops back to the node through a conditional edge, at most
+3 times, with no delay and no shared failure state: during an outage every
+request hits the dependency three times in a row. with_retry() wraps ANY
+LangGraph node function (sync or async) instead:
+
+- exponential backoff with full jitter between attempts
+- a retry budget per dependency (retries <= a fraction of calls), so a
+  fleet of callers cannot multiply load during an outage
+- a circuit breaker per dependency: after N consecutive failures it opens
+  and calls fail fast until a cool-down probe succeeds
+- only exceptions in RetryPolicy.retry_on count as dependency failures
+  (retried, counted by the breaker); any other exception fails at once
+- async nodes sleep with `await asyncio.sleep` (never block the loop)
+- counters per dependency via retry_metrics()
+
+Usage:
+    node = with_retry(fetch_stock_node, dependency="alpha_vantage",
+                      policy=RetryPolicy(max_attempts=4, base_delay=0.2),
+                      on_failure=lambda state, exc: {"error": str(exc)})
+    graph.add_node("fetch_stock", node)
+"""
+
+import asyncio
+import functools
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple, Type
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised (fast) while a dependency's circuit breaker is open."""
+
+
+# ----------------------------------------------------
+# 1. Policy: how many attempts, how long to wait
+# ----------------------------------------------------
+class RetryPolicy:
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 5.0,
+        retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+
+    def delay(self, attempt: int) -> float:
+        """Full jitter: uniform(0, min(max_delay, base * 2^(attempt-1)))."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+# ----------------------------------------------------
+# 2. Shared per-dependency state
+# ----------------------------------------------------
+class RetryBudget:
+    """Token bucket: every call earns `ratio` tokens, every retry spends one."""
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            return False
+
+
+class CircuitBreaker:
+    """closed -> open after N consecutive failures -> half_open after cool-down."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "half_open" and not self._probing:
+                self._probing = True  # let exactly one probe through
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+
+    def release(self) -> None:
+        """The call ended without a verdict on the dependency: free the probe slot."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+
+class Dependency:
+    def __init__(self, name: str, breaker: CircuitBreaker, budget: RetryBudget):
+        self.name = name
+        self.breaker = breaker
+        self.budget = budget
+        self.counters = dict.fromkeys(
+            ["calls", "attempts", "retries", "successes", "failures",
+             "short_circuits", "budget_exhausted"], 0
+        )
+        self._lock = threading.Lock()
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.counters[key] += 1
+
+
+_DEPENDENCIES: Dict[str, Dependency] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_dependency(
+    name: str,
+    breaker: Optional[CircuitBreaker] = None,
+    budget: Optional[RetryBudget] = None,
+) -> Dependency:
+    """Get-or-create the shared breaker/budget/counters for a dependency.
+
+    A breaker / budget passed for an already registered dependency must be
+    the one it already has: a different one would silently do nothing, so
+    it raises ValueError instead.
+    """
+    with _REGISTRY_LOCK:
+        dep = _DEPENDENCIES.get(name)
+        if dep is None:
+            dep = _DEPENDENCIES[name] = Dependency(
+                name, breaker or CircuitBreaker(), budget or RetryBudget()
+            )
+        elif (breaker is not None and breaker is not dep.breaker) or (
+            budget is not None and budget is not dep.budget
+        ):
+            raise ValueError(
+                f"dependency {name!r} is already registered with another breaker/budget; "
+                f"pass the same objects (get_dependency({name!r}).breaker / .budget) or none"
+            )
+        return dep
+
+
+def retry_metrics() -> Dict[str, dict]:
+    """Snapshot of counters + breaker state for every dependency."""
+    return {
+        name: {**dep.counters, "breaker": dep.breaker.state, "budget_tokens": round(dep.budget.tokens, 2)}
+        for name, dep in _DEPENDENCIES.items()
+    }
+
+
+# ----------------------------------------------------
+# 3. The wrapper
+# ----------------------------------------------------
+def _next_step(dep: Dependency, policy: RetryPolicy, attempt: int, exc: BaseException) -> Optional[float]:
+    """Record a failure; return the delay before the next attempt, or None to stop."""
+    if not isinstance(exc, policy.retry_on):
+        # not a dependency failure (e.g. a bug or bad input): no retry, and
+        # the breaker must not open because of it
+        dep.breaker.release()
+        return None
+    dep.breaker.record_failure()
+    if attempt >= policy.max_attempts:
+        return None
+    if dep.breaker.state == "open":
+        return None  # this failure tripped the breaker: stop now
+    if not dep.budget.withdraw():
+        dep.count("budget_exhausted")
+        return None
+    dep.count("retries")
+    return policy.delay(attempt)
+
+
+def with_retry(
+    node: Callable,
+    dependency: str,
+    policy: Optional[RetryPolicy] = None,
+    on_failure: Optional[Callable[[dict, BaseException], dict]] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    budget: Optional[RetryBudget] = None,
+) -> Callable:
+    """Wrap a LangGraph node with backoff, retry budget and circuit breaker.
+
+    on_failure(state, exc) turns the final error into a state update
+    (soft-fail); without it the last exception is raised.
+    """
+    policy = policy or RetryPolicy()
+    dep = get_dependency(dependency, breaker, budget)
+
+    def fail(state, exc):
+        dep.count("failures")
+        if on_failure is None:
+            raise exc
+        return on_failure(state, exc)
+
+    def fast_fail(state):
+        dep.count("short_circuits")
+        return fail(state, CircuitOpenError(f"circuit open for '{dependency}'"))
+
+    if asyncio.iscoroutinefunction(node):
+        @functools.wraps(node)
+        async def async_wrapper(state, *args, **kwargs):
+            dep.count("calls")
+            dep.budget.deposit()
+            attempt = 0
+            while True:
+                if not dep.breaker.allow():
+                    return fast_fail(state)
+                attempt += 1
+                dep.count("attempts")
+                try:
+                    result = await node(state, *args, **kwargs)
+                except Exception as exc:
+                    delay = _next_step(dep, policy, attempt, exc)
+                    if delay is None:
+                        return fail(state, exc)
+                    await asyncio.sleep(delay)
+                    continue
+                dep.breaker.record_success()
+                dep.count("successes")
+                return result
+
+        return async_wrapper
+
+    @functools.wraps(node)
+    def wrapper(state, *args, **kwargs):
+        dep.count("calls")
+        dep.budget.deposit()
+        attempt = 0
+        while True:
+            if not dep.breaker.allow():
+                return fast_fail(state)
+            attempt += 1
+            dep.count("attempts")
+            try:
+                result = node(state, *args, **kwargs)
+            except Exception as exc:
+                delay = _next_step(dep, policy, attempt, exc)
+                if delay is None:
+                    return fail(state, exc)
+                time.sleep(delay)
+                continue
+            dep.breaker.record_success()
+            dep.count("successes")
+            return result
+
+    return wrapper
@@ -0,0 +1,106 @@
+"""
+Tool Cache – opt-in memoization for the TOOLS registry
+
+ReAct loops often call the same tool with the same arguments again (e.g. to
+re-verify a result). ToolCache remembers results:
+
+- key = tool name + canonicalized args (key order / 10 vs 10.0 don't matter)
+- per-tool TTL: pure tools (calculate_area) can live FOREVER, network
+  tools (an Alpha Vantage quote fetch) get a short TTL
+- tools without a TTL entry are never cached (opt-in)
+- LRU size bound + hit/miss counters per tool
+- thread-safe, because ToolExecutor runs tools on a thread pool
+
+Usage:
+    cache = ToolCache(ttls={"calculate_area": FOREVER, "fetch_stock_price": 60})
+    executor = ToolExecutor(TOOLS, cache=cache)
+    cache.stats()
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+FOREVER = float("inf")
+_MISSING = object()
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def canonical_key(name: str, args: Any) -> str:
+    return name + ":" + json.dumps(
+        _normalize(args), sort_keys=True, separators=(",", ":"), default=str
+    )
+
+
+class ToolCache:
+    """LRU + TTL result cache keyed by (tool name, canonical args)."""
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_size: int = 1024):
+        self.ttls = dict(ttls or {})
+        self.max_size = max_size
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+    def enabled(self, name: str) -> bool:
+        return name in self.ttls
+
+    def get(self, name: str, args: Any) -> Any:
+        """Cached value, or _MISSING (use `is_hit`)."""
+        if not self.enabled(name):
+            return _MISSING
+        key = canonical_key(name, args)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits[name] = self.hits.get(name, 0) + 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]  # expired
+            self.misses[name] = self.misses.get(name, 0) + 1
+            return _MISSING
+
+    def put(self, name: str, args: Any, value: Any) -> None:
+        if not self.enabled(name):
+            return
+        expires = time.monotonic() + self.ttls[name]
+        key = canonical_key(name, args)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    @staticmethod
+    def is_hit(value: Any) -> bool:
+        return value is not _MISSING
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        return {
+            "size": len(self._data),
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            "per_tool": {
+                name: {"hits": self.hits.get(name, 0), "misses": self.misses.get(name, 0)}
+                for name in self.ttls
+            },
+        }
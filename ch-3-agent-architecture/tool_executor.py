@@ -0,0 +1,151 @@
+"""
+Tool Executor – run a turn's tool calls concurrently
+
+tool_node in 1-react-agent.py runs `last.tool_calls` one after another, so a
+turn with several independent I/O-bound tools costs the SUM of their
+latencies. ToolExecutor dispatches them all at once:
+
+- sync tools run on a shared thread pool (`tool.invoke`)
+- async tools run with `tool.ainvoke`
+- every call has a timeout (per-tool override possible)
+- ToolMessages come back in the ORIGINAL call order
+
+A turn now costs about as much as its slowest tool. Failures and timeouts
+become error ToolMessages (soft-fail, like 2-retry-tool.py) so the agent
+can read them and decide what to do.
+
+Pass a ToolCache (tool_cache.py) to skip calls whose result is still cached.
+
+Note: a timed-out sync tool cannot be killed; its thread finishes in the
+background and its result is discarded.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import ToolMessage
+
+from tool_cache import ToolCache
+
+
+def _is_async_tool(tool) -> bool:
+    return getattr(tool, "coroutine", None) is not None and getattr(tool, "func", None) is None
+
+
+def _ok(call: dict, result: Any) -> ToolMessage:
+    return ToolMessage(name=call["name"], content=str(result), tool_call_id=call["id"])
+
+
+def _error(call: dict, message: str) -> ToolMessage:
+    return ToolMessage(
+        name=call["name"],
+        content=f"Error: {message}",
+        tool_call_id=call["id"],
+        status="error",
+    )
+
+
+class ToolExecutor:
+    """Concurrent, order-preserving tool-call runner for a TOOLS registry."""
+
+    def __init__(
+        self,
+        tools: Dict[str, Any],
+        timeout: float = 30.0,
+        timeouts: Optional[Dict[str, float]] = None,
+        max_workers: int = 8,
+        cache: Optional[ToolCache] = None,
+    ):
+        self.tools = tools
+        self.cache = cache
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+        self.max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _timeout_for(self, name: str) -> float:
+        return self.timeouts.get(name, self.timeout)
+
+    def _cached(self, call: dict):
+        if self.cache is None:
+            return None
+        value = self.cache.get(call["name"], call["args"])
+        return _ok(call, value) if self.cache.is_hit(value) else None
+
+    def _store(self, call: dict, result: Any) -> None:
+        if self.cache is not None:
+            self.cache.put(call["name"], call["args"], result)
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        # one pool for the process: no thread start-up cost per turn
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="tool")
+        return self._pool
+
+    # ---------- sync graphs ----------
+    def run(self, tool_calls: List[dict]) -> List[ToolMessage]:
+        """Run all calls concurrently; block until each finishes or times out."""
+        start = time.monotonic()
+        futures = []
+        for call in tool_calls:
+            tool = self.tools.get(call["name"])
+            hit = self._cached(call)
+            if tool is None or hit is not None:
+                futures.append(hit)
+            elif _is_async_tool(tool):
+                futures.append(self.pool.submit(asyncio.run, tool.ainvoke(call["args"])))
+            else:
+                futures.append(self.pool.submit(tool.invoke, call["args"]))
+
+        messages = []
+        for call, fut in zip(tool_calls, futures):
+            if fut is None:
+                messages.append(_error(call, f"unknown tool '{call['name']}'"))
+                continue
+            if isinstance(fut, ToolMessage):  # cache hit
+                messages.append(fut)
+                continue
+            limit = self._timeout_for(call["name"])
+            remaining = max(0.0, start + limit - time.monotonic())
+            try:
+                result = fut.result(timeout=remaining)
+                self._store(call, result)
+                messages.append(_ok(call, result))
+            except FutureTimeout:
+                fut.cancel()
+                messages.append(_error(call, f"tool '{call['name']}' timed out after {limit}s"))
+            except Exception as e:
+                messages.append(_error(call, f"tool '{call['name']}' failed: {e}"))
+        return messages
+
+    # ---------- async graphs ----------
+    async def arun(self, tool_calls: List[dict]) -> List[ToolMessage]:
+        """Async variant: gather all calls, each under its own timeout."""
+        async def one(call: dict) -> ToolMessage:
+            tool = self.tools.get(call["name"])
+            if tool is None:
+                return _error(call, f"unknown tool '{call['name']}'")
+            hit = self._cached(call)
+            if hit is not None:
+                return hit
+            limit = self._timeout_for(call["name"])
+            try:
+                if _is_async_tool(tool):
+                    result = await asyncio.wait_for(tool.ainvoke(call["args"]), limit)
+                else:
+                    loop = asyncio.get_running_loop()
+                    result = await asyncio.wait_for(
+                        loop.run_in_executor(self.pool, tool.invoke, call["args"]), limit
+                    )
+                self._store(call, result)
+                return _ok(call, result)
+            except asyncio.TimeoutError:
+                return _error(call, f"tool '{call['name']}' timed out after {limit}s")
+            except Exception as e:
+                return _error(call, f"tool '{call['name']}' failed: {e}")
+
+        # gather preserves the order of its arguments
+        return list(await asyncio.gather(*(one(c) for c in tool_calls)))
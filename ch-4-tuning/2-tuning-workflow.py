@@ -1,8 +1,16 @@
 # Prompt-tuning experiment
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "ch-7-deployment" / "minilab"))
+
 from langchain_core.prompts import ChatPromptTemplate
 import os
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+from llm_factory import make_chat_model
+from completion_cache import enable_completion_cache
+from scorecard import Scorecard
+from tuning_engine import TuningEngine, grid
 
 load_dotenv()
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
@@ -10,13 +18,52 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 prompt = ChatPromptTemplate.from_template("Explain {concept} in simple 2 sentences.")
 
 # LLM for summarization
-llm = ChatGoogleGenerativeAI(
+llm = make_chat_model(
     model="gemini-2.5-flash",
     google_api_key=GOOGLE_API_KEY,
     temperature=0.3,
 )
 
+# LLM_CACHE=record|replay: reuse completions from earlier runs (completion_cache.py)
+completion_cache = enable_completion_cache()
+
+# One immutable client per temperature (the factory shares each one), so
+# no other caller ever sees a temperature it did not ask for
 for t in [0.2, 0.5, 0.8]:
-    llm.temperature = t
-    response = llm.invoke(prompt.format(concept="Agent Evaluation"))
+    llm_t = make_chat_model(model="gemini-2.5-flash", google_api_key=GOOGLE_API_KEY, temperature=t)
+    response = llm_t.invoke(prompt.format(concept="Agent Evaluation"))
     print(f"Temperature {t}: {response.content}\n")
+
+# Search prompt x temperature in parallel, stopping weak configs early
+# (tuning_engine.py): a 2-sentence, plain-word explanation scores best.
+def score_explanation(concept, expected, output):
+    sentences = [s for s in output.replace("!", ".").replace("?", ".").split(".") if s.strip()]
+    words = output.split() or [""]
+    return {
+        "coherence": 1.0 if len(sentences) == 2 else 0.5,
+        "explanation_quality": 1.0 if sum(map(len, words)) / len(words) < 7 else 0.5,
+    }
+
+concepts = ["Agent Evaluation", "Prompt Tuning", "Temperature", "Guardrails", "Tool Calling",
+            "Retrieval", "Memory", "Latency Budgets", "Rate Limits"]
+configs = grid({
+    "model": ["gemini-2.5-flash"],
+    "temperature": [0.2, 0.5, 0.8],
+    "prompt": [
+        "Explain {concept} in simple 2 sentences.",
+        "You are a patient teacher. In exactly two short sentences, explain {concept}.",
+        "Define {concept} for a beginner in two sentences, without jargon.",
+    ],
+})
+engine = TuningEngine(
+    score_explanation,
+    scorecard=Scorecard.from_template(scales={"coherence": (0, 1), "explanation_quality": (0, 1)}),
+    base_params={"google_api_key": GOOGLE_API_KEY},
+    min_items=1,  # 9 configs, 9 concepts: rungs of 1, 3 and 9 items
+    on_rung=lambda rung, trials: print(f"rung {rung}: {len(trials)} configs, best {trials[0].objective:.2f}"),
+)
+best = engine.run(configs, [(c, None) for c in concepts])[0]
+print(f"Best config ({best.items} items, score {best.objective:.2f}): {best.config}")
+
+if completion_cache:
+    print("completion cache:", completion_cache.stats())
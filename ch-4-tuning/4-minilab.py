@@ -1,22 +1,35 @@
 # 4.6 Mini Lab – Evaluate and Tune an Agent 
 # Add your Google API key to a .env file as GOOGLE_API_KEY
 
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "ch-7-deployment" / "minilab"))
+
 from dotenv import load_dotenv
+import hashlib
+import inspect
+import json
 import os
-import numpy as np
-from langchain_google_genai import ChatGoogleGenerativeAI
+from llm_factory import make_chat_model
+from eval_runner import EvalRunner
+from completion_cache import enable_completion_cache
+from scorecard import ScoreTable, Scorecard
 
 # Load environment variables
 load_dotenv()
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
 # Initialize Gemini model
-llm = ChatGoogleGenerativeAI(
+llm = make_chat_model(
     model="gemini-2.5-flash",
     google_api_key=GOOGLE_API_KEY,
     temperature=0.3,
 )
 
+# LLM_CACHE=record|replay: re-score earlier completions offline (completion_cache.py)
+completion_cache = enable_completion_cache()
+
 # 1. Agent logic
 def agent_response(prompt):
     """Simple wrapper to invoke the Gemini model."""
@@ -24,32 +37,79 @@ def agent_response(prompt):
     return result.content if hasattr(result, "content") else str(result)
 
 # 2. Simple evaluation metrics
-def evaluate_agent(agent_fn, prompts, answers):
-    """Evaluates accuracy and coherence heuristically."""
-    results = []
-    for prompt, expected in zip(prompts, answers):
-        output = agent_fn(prompt)
-        accuracy = 1.0 if expected.lower() in output.lower() else 0.5
-        coherence = 1.0 if len(output.split()) > 5 else 0.5
-        results.append({"prompt": prompt, "accuracy": accuracy, "coherence": coherence})
-    return results
+def score_output(prompt, expected, output):
+    """Scores accuracy and coherence heuristically."""
+    accuracy = 1.0 if expected.lower() in output.lower() else 0.5
+    coherence = 1.0 if len(output.split()) > 5 else 0.5
+    return {"accuracy": accuracy, "coherence": coherence}
+
+def show(record):
+    if record.get("resumed"):
+        return
+    if "error" in record:
+        print(f"Prompt: {record['prompt']}\n  Error: {record['error']}\n")
+        return
+    s = record["scores"]
+    print(f"Prompt: {record['prompt']}")
+    print(f"  Accuracy: {s['accuracy']:.2f}, Coherence: {s['coherence']:.2f}\n")
+
+# Everything besides the dataset that shapes a result: a change here means
+# earlier results in eval_results-<fingerprint>.jsonl must not be reused
+fingerprint = hashlib.sha256(
+    json.dumps([llm._identifying_params, inspect.getsource(score_output)], sort_keys=True, default=str).encode()
+).hexdigest()[:12]
+
+def evaluate_agent(agent_fn, prompts, answers, categories=None, out_path=None, on_result=show):
+    """Evaluates items concurrently (rate-limited), streaming each result to
+    out_path; re-running with the same config resumes from that file.
+    Returns the aggregates."""
+    categories = categories or [None] * len(prompts)
+    items = ({"prompt": p, "expected": a, "category": c} for p, a, c in zip(prompts, answers, categories))
+    runner = EvalRunner(
+        agent_fn,
+        score_output,
+        out_path or f"eval_results-{fingerprint}.jsonl",
+        max_concurrency=int(os.getenv("EVAL_CONCURRENCY", "8")),
+        requests_per_minute=float(os.getenv("EVAL_RPM", "0")),
+        on_result=on_result,
+        fingerprint=fingerprint,
+    )
+    return runner.run(items)
 
 # 3. Sample dataset
 dataset = [
-    ("What is the capital of France?", "Paris"),
-    ("Who wrote Hamlet?", "Shakespeare"),
-    ("What is 2 + 2?", "4"),
+    ("What is the capital of France?", "Paris", "geography"),
+    ("Who wrote Hamlet?", "Shakespeare", "literature"),
+    ("What is 2 + 2?", "4", "math"),
 ]
 
-# 4. Evaluate agent performance
-scores = evaluate_agent(agent_response, [q for q, _ in dataset], [a for _, a in dataset])
+# 4. Evaluate agent performance (results are displayed as they finish)
+card = Scorecard.from_template(scales={"accuracy": (0, 1), "coherence": (0, 1)})
+table = ScoreTable(card.metrics)
 
-# 5. Display results
-for s in scores:
-    print(f"Prompt: {s['prompt']}")
-    print(f"  Accuracy: {s['accuracy']:.2f}, Coherence: {s['coherence']:.2f}\n")
+def collect(record):
+    show(record)
+    table.append(record, defaults={"model": llm.model})
+
+summary = evaluate_agent(agent_response, *map(list, zip(*dataset)), on_result=collect)
+
+# 5. Aggregate metrics (computed incrementally by the runner)
+if summary["resumed"]:
+    print(f"Resumed {summary['resumed']} items from eval_results-{fingerprint}.jsonl")
+metrics = summary["metrics"]
+if summary["succeeded"]:
+    avg_accuracy = metrics["accuracy"]["mean"]
+    avg_coherence = metrics["coherence"]["mean"]
+    print(f"Average Accuracy: {avg_accuracy:.2f}, Average Coherence: {avg_coherence:.2f}")
 
-# 6. Aggregate metrics
-avg_accuracy = np.mean([s["accuracy"] for s in scores])
-avg_coherence = np.mean([s["coherence"] for s in scores])
-print(f"Average Accuracy: {avg_accuracy:.2f}, Average Coherence: {avg_coherence:.2f}")
+# 6. Weighted scorecard from the reusable template (3-reusable-eval-template.json).
+#    The heuristics above score 0..1, not the template's 1–5; safety and
+#    explanation_quality are not measured here, so their weight is skipped.
+if summary["succeeded"]:
+    print(f"Weighted score: {card.summary(table)['composite']:.2f}")
+    for row in card.breakdown(table, by="category"):
+        print(f"  {row['category']:<12} {row['composite']:.2f}  ({row['count']} items, {row['latency_ms']:.0f} ms)")
+if summary["failed"]:
+    print(f"{summary['failed']} items failed; re-run to retry them")
+if completion_cache:
+    print("completion cache:", completion_cache.stats())
@@ -0,0 +1,58 @@
+"""
+Benchmark – Scorecard composite + grouped breakdowns at 100k+ rows
+
+Fills a ScoreTable with synthetic eval results (1–5 ratings, lognormal
+latency, ~5% unmeasured values) across prompt categories and models, then
+times the vectorized composite score and the per-category / per-model
+breakdowns.
+
+Run:
+    python bench_scorecard.py              # 200k rows
+    python bench_scorecard.py 1000000
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from scorecard import ScoreTable, Scorecard
+
+CATEGORIES = ["geography", "literature", "math", "coding", "safety", "support", "finance", "health"]
+MODELS = ["gemini-2.5-flash", "gemini-2.5-pro", "gemini-2.0-flash"]
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = np.random.default_rng(7)
+    card = Scorecard.from_template()
+
+    columns = {}
+    for c in card.criteria:
+        if c.higher_is_better:
+            values = rng.integers(int(c.low), int(c.high) + 1, n).astype(np.float64)
+        else:
+            values = rng.lognormal(np.log(1200), 0.6, n)
+        values[rng.random(n) < 0.05] = np.nan
+        columns[c.name] = values
+    groups = {"category": rng.choice(CATEGORIES, n), "model": rng.choice(MODELS, n)}
+
+    start = time.perf_counter()
+    table = ScoreTable(card.metrics, capacity=n)
+    table.add_columns(columns, groups)
+    load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    composite = card.score(table)
+    score_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    by_category = card.breakdown(table, by="category", composite=composite)
+    by_model = card.breakdown(table, by="model", composite=composite)
+    breakdown_s = time.perf_counter() - start
+
+    print(f"rows          : {len(table):,} x {len(card.metrics)} metrics")
+    print(f"load          : {load_s * 1e3:.1f} ms")
+    print(f"composite     : {score_s * 1e3:.1f} ms (mean {np.nanmean(composite):.3f})")
+    print(f"breakdowns    : {breakdown_s * 1e3:.1f} ms (category + model)")
+    print("best category :", by_category[0])
+    print("by model      :", [(r["model"], r["composite"]) for r in by_model])
@@ -0,0 +1,174 @@
+"""
+Completion Cache – content-addressed, on-disk cache of LLM completions
+
+2-tuning-workflow.py and evaluate_agent (4-minilab.py) send the same
+prompts with the same settings on every run, so changing only the scoring
+code still pays for every completion again. CompletionCache is a LangChain
+cache (set_llm_cache) stored in one SQLite file:
+
+- key = sha256(model + temperature + all other generation params + prompt),
+  exactly what LangChain passes as (llm_string, prompt), so any parameter
+  change is a different entry
+- values are zlib-compressed JSON (message dicts + generation info)
+- mode "record" (default): hits are served, misses call the model and
+  are stored; mode "replay": a miss raises CacheMissError, so a re-scoring
+  run is guaranteed to be offline and free
+- size-bounded: past `max_bytes` the least recently used entries go
+- stats(): hits, misses, hit rate, entries, bytes on disk
+- thread-safe (EvalRunner calls the model from a thread pool)
+
+Usage (scripts in this chapter call enable_completion_cache()):
+    LLM_CACHE=record python 4-minilab.py     # first run: fills the cache
+    LLM_CACHE=replay python 4-minilab.py     # re-score offline
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.globals import set_llm_cache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+DEFAULT_PATH = Path(__file__).resolve().parent / ".llm_cache.sqlite"
+
+
+def _encode(generations: Sequence[Generation]) -> bytes:
+    items = []
+    for g in generations:
+        if isinstance(g, ChatGeneration):
+            items.append({"message": message_to_dict(g.message), "info": g.generation_info})
+        else:
+            items.append({"text": g.text, "info": g.generation_info})
+    return zlib.compress(json.dumps(items).encode())
+
+
+def _decode(value: bytes) -> list:
+    generations = []
+    for item in json.loads(zlib.decompress(value)):
+        if "message" in item:
+            message = messages_from_dict([item["message"]])[0]
+            generations.append(ChatGeneration(message=message, generation_info=item["info"]))
+        else:
+            generations.append(Generation(text=item["text"], generation_info=item["info"]))
+    return generations
+
+
+class CacheMissError(LookupError):
+    """Replay-only mode and the completion is not in the cache."""
+
+
+class CompletionCache(BaseCache):
+    def __init__(self, path=DEFAULT_PATH, mode: str = "record", max_bytes: int = 512 * 2**20):
+        if mode not in ("record", "replay"):
+            raise ValueError("mode must be 'record' or 'replay'")
+        self.path = Path(path)
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS completions (
+                   key TEXT PRIMARY KEY,
+                   value BLOB NOT NULL,
+                   size INTEGER NOT NULL,
+                   created REAL NOT NULL,
+                   last_used REAL NOT NULL
+               )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS completions_lru ON completions(last_used)")
+        self._bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+
+    @staticmethod
+    def key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode()).hexdigest()
+
+    # ---------- BaseCache ----------
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        key = self.key(prompt, llm_string)
+        with self._lock:
+            row = self._db.execute("SELECT value FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._db.execute("UPDATE completions SET last_used = ? WHERE key = ?", (time.time(), key))
+        if row is None:
+            if self.mode == "replay":
+                raise CacheMissError(f"completion {key[:12]} is not cached (replay-only mode)")
+            return None
+        return _decode(row[0])
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        value = _encode(return_val)
+        now = time.time()
+        key = self.key(prompt, llm_string)
+        with self._lock:
+            old = self._db.execute("SELECT size FROM completions WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO completions (key, value, size, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            self._bytes += len(value) - (old[0] if old else 0)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries down to 90% of max_bytes."""
+        target = self.max_bytes * 0.9
+        rows = self._db.execute("SELECT key, size FROM completions ORDER BY last_used")
+        doomed = []
+        for key, size in rows:
+            if self._bytes <= target:
+                break
+            doomed.append((key,))
+            self._bytes -= size
+        self._db.executemany("DELETE FROM completions WHERE key = ?", doomed)
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM completions")
+            self._bytes = 0
+
+    # ---------- reporting ----------
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": entries,
+            "bytes": self._bytes,
+        }
+
+
+def enable_completion_cache() -> Optional[CompletionCache]:
+    """Install the cache for every model in this process if LLM_CACHE is set.
+
+    LLM_CACHE=record|replay, LLM_CACHE_PATH (default ch-4-tuning/.llm_cache.sqlite),
+    LLM_CACHE_MAX_MB (default 512).
+    """
+    mode = os.getenv("LLM_CACHE", "").lower()
+    if mode in ("", "off", "0"):
+        return None
+    cache = CompletionCache(
+        os.getenv("LLM_CACHE_PATH", DEFAULT_PATH),
+        mode=mode,
+        max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", "512")) * 2**20),
+    )
+    set_llm_cache(cache)
+    return cache
@@ -0,0 +1,212 @@
+"""
+Eval Runner – concurrent, rate-limited, resumable evaluate_agent
+
+evaluate_agent in 4-minilab.py calls agent_fn(prompt) one item at a time
+and builds the full `results` list before anything is aggregated: a
+5,000-item regression suite spends hours waiting on the LLM, and a crash
+at item 4,900 loses everything. EvalRunner:
+
+- runs items on a thread pool (max_concurrency in flight), reading the
+  dataset lazily (any iterable / generator)
+- optional requests-per-minute limit, shared with the LLM clients'
+  fair-queueing limiter (ch-7-deployment/minilab/llm_rate_limiter.py)
+- appends one JSON line per item to `out_path` as soon as it finishes
+  (flushed, so an interrupted run leaves only complete lines)
+- resume: an item is skipped only if `out_path` already has a successful
+  record with the same key = hash(fingerprint, id, prompt, expected); pass
+  a `fingerprint` of everything else that shapes the answer (model,
+  temperature, prompt template, ...) so changing any of it re-runs the
+  item instead of reusing a stale score. Failed items are retried, and
+  on_result also sees every reused record (with "resumed": True)
+- aggregates (count / mean / std / min / max per metric) are updated
+  incrementally, nothing keeps the per-item results in memory
+
+Usage:
+    runner = EvalRunner(agent_fn, score_fn, "eval_results.jsonl",
+                        max_concurrency=16, requests_per_minute=600,
+                        fingerprint="gemini-2.5-flash|t=0.3|prompt-v2")
+    summary = runner.run(dataset)   # [(prompt, expected), ...] or dicts
+
+Importing this module does not touch sys.path: the calling script puts
+ch-7-deployment/minilab on it first (as 4-minilab.py does).
+"""
+
+import hashlib
+import json
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+from llm_rate_limiter import ProviderRateLimiter
+
+
+# ----------------------------------------------------
+# 1. Incremental aggregates
+# ----------------------------------------------------
+class RunningStats:
+    """Welford's online mean / variance, plus min and max."""
+
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def as_dict(self) -> dict:
+        return {"count": self.count, "mean": round(self.mean, 4), "std": round(self.std, 4),
+                "min": self.min if self.count else None, "max": self.max if self.count else None}
+
+
+class Aggregates:
+    def __init__(self):
+        self.metrics: Dict[str, RunningStats] = {}
+        self.succeeded = 0
+        self.failed = 0
+        self.resumed = 0
+
+    def add(self, record: dict) -> None:
+        if "error" in record:
+            self.failed += 1
+            return
+        self.succeeded += 1
+        for name, value in record["scores"].items():
+            self.metrics.setdefault(name, RunningStats()).add(float(value))
+        self.metrics.setdefault("latency_ms", RunningStats()).add(record["latency_ms"])
+
+    def summary(self) -> dict:
+        return {
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "resumed": self.resumed,
+            "metrics": {name: stats.as_dict() for name, stats in self.metrics.items()},
+        }
+
+
+# ----------------------------------------------------
+# 2. The runner
+# ----------------------------------------------------
+def _normalize(index: int, item) -> dict:
+    if isinstance(item, dict):
+        # extra fields (category, ...) are carried into the output record
+        return {**item, "id": str(item.get("id", index)), "prompt": item["prompt"], "expected": item.get("expected")}
+    prompt, expected = item
+    return {"id": str(index), "prompt": prompt, "expected": expected}
+
+
+def item_key(fingerprint: str, item: dict) -> str:
+    """Identity of one evaluation: run config + the item's own content."""
+    raw = json.dumps([fingerprint, item["id"], item["prompt"], item["expected"]], default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def _ends_mid_line(path: Path) -> bool:
+    with path.open("rb") as f:
+        if f.seek(0, 2) == 0:
+            return False
+        f.seek(-1, 2)
+        return f.read(1) != b"\n"
+
+
+class EvalRunner:
+    def __init__(
+        self,
+        agent_fn: Callable[[str], str],
+        score_fn: Callable[[str, Optional[str], str], Dict[str, float]],
+        out_path: str,
+        max_concurrency: int = 8,
+        requests_per_minute: float = 0,
+        resume: bool = True,
+        on_result: Optional[Callable[[dict], None]] = None,
+        fingerprint: str = "",
+    ):
+        self.agent_fn = agent_fn
+        self.score_fn = score_fn
+        self.out_path = Path(out_path)
+        self.max_concurrency = max_concurrency
+        self.limiter = ProviderRateLimiter(rpm=requests_per_minute, tpm=0) if requests_per_minute else None
+        self.resume = resume
+        self.on_result = on_result
+        self.fingerprint = fingerprint
+        self.aggregates = Aggregates()
+
+    def _load_done(self) -> Dict[str, dict]:
+        """Successful records of earlier runs, by item key."""
+        done: Dict[str, dict] = {}
+        if not (self.resume and self.out_path.exists()):
+            return done
+        with self.out_path.open() as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line of an interrupted run
+                if "error" in record or "key" not in record:
+                    continue  # failed items run again; unkeyed = older format
+                done.setdefault(record["key"], record)
+        return done
+
+    def _run_one(self, item: dict) -> dict:
+        if self.limiter is not None:
+            self.limiter.acquire()
+        start = time.perf_counter()
+        try:
+            output = self.agent_fn(item["prompt"])
+            latency_ms = (time.perf_counter() - start) * 1000
+            scores = self.score_fn(item["prompt"], item["expected"], output)
+            return {**item, "output": output, "scores": scores, "latency_ms": round(latency_ms, 1)}
+        except Exception as e:
+            return {**item, "error": f"{type(e).__name__}: {e}"}
+
+    def run(self, dataset: Iterable) -> dict:
+        """Evaluate every item not already in out_path; return the summary."""
+        done = self._load_done()
+        pending = set()
+        mode = "a" if self.resume else "w"
+        with self.out_path.open(mode) as out, ThreadPoolExecutor(self.max_concurrency) as pool:
+            if mode == "a" and _ends_mid_line(self.out_path):
+                out.write("\n")  # don't glue new records onto a torn line
+
+            def drain(block_until: int) -> None:
+                nonlocal pending
+                while len(pending) > block_until:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        record = fut.result()
+                        out.write(json.dumps(record) + "\n")
+                        out.flush()
+                        self.aggregates.add(record)
+                        if self.on_result:
+                            self.on_result(record)
+
+            for index, raw in enumerate(dataset):
+                item = _normalize(index, raw)
+                item["key"] = item_key(self.fingerprint, item)
+                previous = done.pop(item["key"], None)
+                if previous is not None:
+                    # only records of items in THIS dataset count as resumed
+                    self.aggregates.add(previous)
+                    self.aggregates.resumed += 1
+                    if self.on_result:
+                        self.on_result({**previous, "resumed": True})
+                    continue
+                pending.add(pool.submit(self._run_one, item))
+                drain(2 * self.max_concurrency)  # bounded read-ahead
+            drain(0)
+        return self.aggregates.summary()
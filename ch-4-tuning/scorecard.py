@@ -0,0 +1,266 @@
+"""
+Scorecard – weighted, vectorized scoring from 3-reusable-eval-template.json
+
+The template defines criteria and weights, but nothing reads it:
+evaluate_agent hard-codes two heuristics and averages them with np.mean
+over a list of dicts. Scorecard turns any template of that shape into a
+scoring engine:
+
+1. Criteria, weights and scales come from the template. "Score 1–5" in a
+   description means a 1..5 scale, `*_ms` metrics are lower-is-better
+   against a latency budget, and an optional "scales" /
+   "latency_budget_ms" entry in the template overrides both
+2. ScoreTable keeps per-item metric values in columnar NumPy arrays (one
+   contiguous float64 row per metric, NaN = not measured) plus dense int
+   codes for the group columns (prompt category, model, ...)
+3. Normalizing, weighting and grouping are single vectorized steps
+   (clip + matrix product, np.bincount per group column). A missing
+   metric drops out of that row's weights instead of counting as 0
+
+EvalRunner records (eval_runner.py) plug in directly: their `scores` plus
+the measured `latency_ms` fill the table.
+
+Usage:
+    card = Scorecard.from_template()
+    table = ScoreTable.from_jsonl("eval_results.jsonl", card.metrics, defaults={"model": "gemini-2.5-flash"})
+    print(card.summary(table))
+    for row in card.breakdown(table, by="category"):
+        print(row)
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_TEMPLATE = Path(__file__).resolve().parent / "3-reusable-eval-template.json"
+DEFAULT_LATENCY_BUDGET_MS = 5000.0
+GROUP_KEYS = ("category", "model")
+_RANGE = re.compile(r"(\d+(?:\.\d+)?)\s*[–-]\s*(\d+(?:\.\d+)?)")
+
+
+# ----------------------------------------------------
+# 1. Criteria from the template
+# ----------------------------------------------------
+@dataclass(frozen=True)
+class Criterion:
+    name: str
+    weight: float
+    low: float
+    high: float
+    higher_is_better: bool = True
+    description: str = ""
+
+
+def _infer_scale(name: str, description: str, latency_budget_ms: float) -> Tuple[float, float, bool]:
+    if name.endswith("_ms"):
+        return 0.0, latency_budget_ms, False
+    match = _RANGE.search(description)
+    if match:
+        return float(match.group(1)), float(match.group(2)), True
+    return 0.0, 1.0, True
+
+
+# ----------------------------------------------------
+# 2. Columnar score storage
+# ----------------------------------------------------
+class ScoreTable:
+    """Per-item metric values (columnar) + group codes, grown by doubling."""
+
+    def __init__(self, metrics: Sequence[str], group_keys: Sequence[str] = GROUP_KEYS, capacity: int = 1024):
+        self.metrics = list(metrics)
+        self.group_keys = list(group_keys)
+        self.size = 0
+        self._values = np.full((len(self.metrics), capacity), np.nan)
+        self._codes = {key: np.zeros(capacity, dtype=np.int32) for key in self.group_keys}
+        self.labels: Dict[str, List[str]] = {key: [] for key in self.group_keys}
+        self._label_ids: Dict[str, Dict[str, int]] = {key: {} for key in self.group_keys}
+
+    # ---------- views ----------
+    @property
+    def values(self) -> np.ndarray:
+        """(metrics, rows) float64, NaN where a metric was not measured."""
+        return self._values[:, :self.size]
+
+    def column(self, metric: str) -> np.ndarray:
+        return self._values[self.metrics.index(metric), :self.size]
+
+    def codes(self, key: str) -> np.ndarray:
+        return self._codes[key][:self.size]
+
+    def __len__(self) -> int:
+        return self.size
+
+    # ---------- growth ----------
+    def _reserve(self, n: int) -> None:
+        capacity = self._values.shape[1]
+        if n <= capacity:
+            return
+        size = max(n, 2 * capacity)
+        values = np.full((len(self.metrics), size), np.nan)
+        values[:, :self.size] = self.values
+        self._values = values
+        for key, old in self._codes.items():
+            grown = np.zeros(size, dtype=old.dtype)
+            grown[:self.size] = old[:self.size]
+            self._codes[key] = grown
+
+    def _label_id(self, key: str, label) -> int:
+        label = "unknown" if label is None else str(label)
+        ids = self._label_ids[key]
+        code = ids.get(label)
+        if code is None:
+            code = ids[label] = len(self.labels[key])
+            self.labels[key].append(label)
+        return code
+
+    # ---------- ingest ----------
+    def append(self, record: Mapping, defaults: Optional[Mapping] = None) -> None:
+        """Add one EvalRunner record (failed items are skipped)."""
+        if "error" in record:
+            return
+        self._reserve(self.size + 1)
+        row = self.size
+        scores = record.get("scores", {})
+        for i, metric in enumerate(self.metrics):
+            value = scores.get(metric, record.get(metric))
+            if value is not None:
+                self._values[i, row] = value
+        for key in self.group_keys:
+            label = record.get(key, (defaults or {}).get(key))
+            self._codes[key][row] = self._label_id(key, label)
+        self.size += 1
+
+    def extend(self, records: Iterable[Mapping], defaults: Optional[Mapping] = None) -> "ScoreTable":
+        for record in records:
+            self.append(record, defaults)
+        return self
+
+    def add_columns(self, columns: Mapping[str, Sequence[float]], groups: Optional[Mapping[str, Sequence]] = None) -> None:
+        """Bulk fast path: whole metric arrays + label arrays at once."""
+        n = len(next(iter(columns.values())))
+        self._reserve(self.size + n)
+        block = slice(self.size, self.size + n)
+        for metric, values in columns.items():
+            self._values[self.metrics.index(metric), block] = values
+        for key in self.group_keys:
+            labels = (groups or {}).get(key)
+            if labels is None:
+                self._codes[key][block] = self._label_id(key, None)
+                continue
+            uniques, inverse = np.unique(np.asarray(labels).astype(str), return_inverse=True)
+            lookup = np.array([self._label_id(key, u) for u in uniques.tolist()], dtype=np.int32)
+            self._codes[key][block] = lookup[inverse.ravel()]
+        self.size += n
+
+    @classmethod
+    def from_jsonl(cls, path, metrics: Sequence[str], group_keys: Sequence[str] = GROUP_KEYS,
+                   defaults: Optional[Mapping] = None) -> "ScoreTable":
+        """Load an EvalRunner output file (last record per id wins)."""
+        latest: Dict[str, dict] = {}
+        with Path(path).open() as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn line of an interrupted run
+                latest[record.get("id", len(latest))] = record
+        return cls(metrics, group_keys, capacity=max(len(latest), 1)).extend(latest.values(), defaults)
+
+
+# ----------------------------------------------------
+# 3. The scoring engine
+# ----------------------------------------------------
+class Scorecard:
+    def __init__(self, criteria: Sequence[Criterion]):
+        self.criteria = list(criteria)
+        self.metrics = [c.name for c in self.criteria]
+        self._low = np.array([c.low for c in self.criteria])[:, None]
+        self._span = np.array([c.high - c.low for c in self.criteria])[:, None]
+        self._flip = np.array([not c.higher_is_better for c in self.criteria])[:, None]
+        self._weights = np.array([c.weight for c in self.criteria])
+
+    @classmethod
+    def from_template(cls, path=DEFAULT_TEMPLATE, scales: Optional[Mapping[str, Tuple[float, float]]] = None) -> "Scorecard":
+        """Build from a {"criteria": {...}, "weights": {...}} template.
+
+        `scales` ({metric: (low, high)}) overrides the template's scales, e.g.
+        for heuristics that score 0..1 instead of 1..5.
+        """
+        template = json.loads(Path(path).read_text())
+        budget = float(template.get("latency_budget_ms", DEFAULT_LATENCY_BUDGET_MS))
+        overrides = {**template.get("scales", {}), **(scales or {})}
+        criteria = []
+        for name, weight in template["weights"].items():
+            description = template.get("criteria", {}).get(name, "")
+            low, high, higher_is_better = _infer_scale(name, description, budget)
+            if name in overrides:
+                low, high = map(float, overrides[name])
+            criteria.append(Criterion(name, float(weight), low, high, higher_is_better, description))
+        return cls(criteria)
+
+    def normalize(self, table: ScoreTable) -> np.ndarray:
+        """(metrics, rows) in 0..1, 1 = best; NaN stays NaN."""
+        normalized = np.clip((table.values - self._low) / self._span, 0.0, 1.0)
+        return np.where(self._flip, 1.0 - normalized, normalized)
+
+    def score(self, table: ScoreTable) -> np.ndarray:
+        """Weighted composite per row in 0..1 (NaN if nothing was measured)."""
+        normalized = self.normalize(table)
+        measured = ~np.isnan(normalized)
+        weight = self._weights @ measured
+        total = self._weights @ np.where(measured, normalized, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return total / weight
+
+    @staticmethod
+    def _means(codes: np.ndarray, values: np.ndarray, groups: int) -> Tuple[np.ndarray, np.ndarray]:
+        measured = ~np.isnan(values)
+        counts = np.bincount(codes, weights=measured, minlength=groups)
+        sums = np.bincount(codes, weights=np.where(measured, values, 0.0), minlength=groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return sums / counts, counts
+
+    def summary(self, table: ScoreTable) -> dict:
+        composite = self.score(table)
+        values = table.values
+        return {
+            "rows": len(table),
+            "composite": round(float(np.nanmean(composite)), 4) if len(table) else None,
+            "metrics": {
+                metric: {
+                    "mean": round(float(np.nanmean(values[i])), 4) if np.any(~np.isnan(values[i])) else None,
+                    "coverage": round(float(np.mean(~np.isnan(values[i]))), 4) if len(table) else 0.0,
+                    "weight": self.criteria[i].weight,
+                }
+                for i, metric in enumerate(self.metrics)
+            },
+        }
+
+    def breakdown(self, table: ScoreTable, by: str = "category",
+                  composite: Optional[np.ndarray] = None) -> List[dict]:
+        """Per-group count, composite and raw metric means, best group first.
+
+        Pass `composite` (from score()) to reuse it across several breakdowns.
+        """
+        codes = table.codes(by)
+        groups = len(table.labels[by])
+        composite, counts = self._means(codes, self.score(table) if composite is None else composite, groups)
+        rows = np.bincount(codes, minlength=groups)
+        metric_means = [self._means(codes, table.values[i], groups)[0] for i in range(len(self.metrics))]
+
+        report = []
+        for g in np.argsort(-np.nan_to_num(composite, nan=-1.0), kind="stable"):
+            if rows[g] == 0:
+                continue
+            report.append({
+                by: table.labels[by][g],
+                "count": int(rows[g]),
+                "composite": round(float(composite[g]), 4) if counts[g] else None,
+                **{m: (None if np.isnan(means[g]) else round(float(means[g]), 4))
+                   for m, means in zip(self.metrics, metric_means)},
+            })
+        return report
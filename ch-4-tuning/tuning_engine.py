@@ -0,0 +1,236 @@
+"""
+Tuning Engine – parallel grid / random search with successive halving
+
+2-tuning-workflow.py sets `llm.temperature = t` on one shared client and
+runs one prompt per setting, one after the other. Any other thread using
+that client sees the change, and a prompt x temperature x model grid
+becomes a long sequential loop. TuningEngine:
+
+- search spaces: grid() enumerates every combination; random_configs()
+  samples n of them (lists = choices, (low, high) tuples = uniform floats)
+- one model per configuration (make_chat_model(**params) returns the
+  caller's own copy over a shared client), so trials are free to run in
+  parallel; the key "prompt" is the prompt template
+- every trial is scored by EvalRunner (eval_runner.py) on the same
+  dataset, into its own JSONL file (tuning_runs/<trial id>.jsonl), so an
+  interrupted search resumes where it stopped. The trial id hashes the
+  config, the base params, the backend, the dataset and the scoring code,
+  so changing any of them starts fresh instead of reusing old results
+- successive halving: all configs start on a small slice of the dataset;
+  after each rung only the best 1/eta continue, on eta times more items,
+  until the survivor(s) have seen the full dataset
+- objective: a Scorecard composite (scorecard.py) or the mean of one metric
+
+Usage:
+    engine = TuningEngine(score_fn, scorecard=Scorecard.from_template(...))
+    configs = grid({"temperature": [0.2, 0.5, 0.8], "prompt": [...]})
+    for trial in engine.run(configs, dataset):
+        print(trial.objective, trial.config)
+
+Importing this module does not touch sys.path: the calling script puts
+ch-7-deployment/minilab on it first (as 2-tuning-workflow.py does).
+"""
+
+import hashlib
+import inspect
+import itertools
+import json
+import math
+import random
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from llm_factory import llm_backend, make_chat_model
+from eval_runner import EvalRunner
+from scorecard import ScoreTable, Scorecard
+
+
+# ----------------------------------------------------
+# 1. Search spaces
+# ----------------------------------------------------
+def grid(space: Mapping[str, Sequence]) -> List[dict]:
+    """Every combination of the values in `space`."""
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+
+def random_configs(space: Mapping[str, Any], n: int, seed: int = 0) -> List[dict]:
+    """n samples: list -> random choice, (low, high) tuple -> uniform float."""
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(n):
+        config = {}
+        for key, values in space.items():
+            if isinstance(values, tuple):
+                config[key] = round(rng.uniform(*values), 3)
+            else:
+                config[key] = rng.choice(list(values))
+        configs.append(config)
+    return configs
+
+
+# ----------------------------------------------------
+# 2. Trials
+# ----------------------------------------------------
+@dataclass
+class Trial:
+    config: dict
+    id: str
+    path: Path
+    objective: float = math.nan
+    items: int = 0          # dataset items evaluated so far
+    failed: int = 0
+    rung: int = 0           # last rung this trial ran in
+    status: str = "pending"  # pending | running | stopped | finished
+    summary: dict = field(default_factory=dict)
+
+
+def _source(fn: Callable) -> str:
+    try:
+        return inspect.getsource(fn)
+    except (OSError, TypeError):
+        return getattr(fn, "__qualname__", repr(fn))
+
+
+def trial_id(config: Mapping, base_params: Mapping = (), dataset: Sequence = (), score_fn=None) -> str:
+    """Hash of everything that determines a trial's results."""
+    # credentials don't change answers (and rotating one shouldn't restart)
+    params = {k: v for k, v in dict(base_params).items() if "api_key" not in k}
+    raw = json.dumps(
+        [config, params, llm_backend(), list(dataset), _source(score_fn) if score_fn else None],
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()[:12]
+
+
+# ----------------------------------------------------
+# 3. The engine
+# ----------------------------------------------------
+class TuningEngine:
+    def __init__(
+        self,
+        score_fn: Callable[[str, Optional[str], str], Dict[str, float]],
+        scorecard: Optional[Scorecard] = None,
+        metric: str = "accuracy",
+        base_params: Optional[Mapping[str, Any]] = None,
+        out_dir: str = "tuning_runs",
+        eta: int = 3,
+        min_items: int = 4,
+        max_parallel_trials: int = 4,
+        per_trial_concurrency: int = 4,
+        on_rung: Optional[Callable[[int, List[Trial]], None]] = None,
+    ):
+        self.score_fn = score_fn
+        self.scorecard = scorecard
+        self.metric = metric
+        self.base_params = dict(base_params or {})
+        self.out_dir = Path(out_dir)
+        self.eta = eta
+        self.min_items = min_items
+        self.max_parallel_trials = max_parallel_trials
+        self.per_trial_concurrency = per_trial_concurrency
+        self.on_rung = on_rung
+
+    # ---------- one configuration ----------
+    def agent_fn(self, config: Mapping) -> Callable[[str], str]:
+        """Model + prompt for one config: input text -> answer."""
+        params = {k: v for k, v in config.items() if k != "prompt"}
+        llm = make_chat_model(**{**self.base_params, **params})
+        template = config.get("prompt")
+        if template is None:
+            return lambda text: llm.invoke(text).content
+        prompt = ChatPromptTemplate.from_template(template)
+        variable = prompt.input_variables[0]
+        return lambda text: llm.invoke(prompt.format_messages(**{variable: text})).content
+
+    def _objective(self, trial: Trial, table: Optional[ScoreTable]) -> float:
+        """NaN when nothing was scored; ranking puts NaN last."""
+        if not trial.summary.get("succeeded"):
+            return math.nan
+        if table is not None:
+            return self.scorecard.summary(table)["composite"]
+        return trial.summary["metrics"].get(self.metric, {}).get("mean", math.nan)
+
+    def _evaluate(self, trial: Trial, items: List[dict]) -> Trial:
+        # score only this rung's items, not whatever else the file holds
+        table = ScoreTable(self.scorecard.metrics) if self.scorecard is not None else None
+        runner = EvalRunner(
+            self.agent_fn(trial.config),
+            self.score_fn,
+            trial.path,
+            max_concurrency=self.per_trial_concurrency,
+            fingerprint=trial.id,
+            on_result=table.append if table is not None else None,
+        )
+        trial.summary = runner.run(items)  # resumes: only new items are run
+        trial.items = min(trial.summary["succeeded"] + trial.summary["failed"], len(items))
+        trial.failed = trial.summary["failed"]
+        trial.objective = self._objective(trial, table)
+        return trial
+
+    @staticmethod
+    def _rank_key(trial: Trial):
+        """Best first; a NaN objective (nothing scored) always sorts last."""
+        return (math.isnan(trial.objective), -trial.objective if not math.isnan(trial.objective) else 0.0)
+
+    # ---------- successive halving ----------
+    def budgets(self, n_configs: int, n_items: int) -> List[int]:
+        """Items per rung, one entry per rung; the last rung is the whole dataset.
+
+        Rung r (of k + 1, with eta**k >= n_configs) gets n_items / eta**(k - r)
+        items, but at least min_items. If the dataset is too small for that,
+        neighbouring rungs share the same budget (survivors are re-ranked on the
+        same items) and a warning says how many items real halving needs.
+        """
+        k = 0
+        while self.eta ** k < n_configs:
+            k += 1
+        floor = min(self.min_items, n_items)
+        budgets = [max(floor, -(-n_items // self.eta ** (k - r))) for r in range(k + 1)]
+        if len(set(budgets)) < len(budgets):
+            warnings.warn(
+                f"{n_items} items are too few to halve {n_configs} configs over {k + 1} rungs "
+                f"(budgets {budgets}); use at least {self.min_items * self.eta ** k} items",
+                stacklevel=2,
+            )
+        return budgets
+
+    def run(self, configs: Sequence[Mapping], dataset: Sequence) -> List[Trial]:
+        """Search `configs` on `dataset`; returns all trials, best first."""
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        items = [
+            {**item, "id": str(item.get("id", i))} if isinstance(item, dict)
+            else {"id": str(i), "prompt": item[0], "expected": item[1]}
+            for i, item in enumerate(dataset)
+        ]
+        trials = []
+        for config in configs:
+            tid = trial_id(config, self.base_params, items, self.score_fn)
+            trials.append(Trial(dict(config), tid, self.out_dir / f"{tid}.jsonl"))
+
+        alive = list(trials)
+        budgets = self.budgets(len(trials), len(items))
+        with ThreadPoolExecutor(self.max_parallel_trials) as pool:
+            for rung, budget in enumerate(budgets):
+                for trial in alive:
+                    trial.status, trial.rung = "running", rung
+                list(pool.map(lambda t: self._evaluate(t, items[:budget]), alive))
+                alive.sort(key=self._rank_key)
+                if self.on_rung:
+                    self.on_rung(rung, alive)
+                if rung == len(budgets) - 1:
+                    break
+                keep = max(1, math.ceil(len(alive) / self.eta))
+                for trial in alive[keep:]:
+                    trial.status = "stopped"
+                alive = alive[:keep]
+
+        for trial in alive:
+            trial.status = "finished"
+        status_rank = {"finished": 0, "stopped": 1}
+        return sorted(trials, key=lambda t: (status_rank.get(t.status, 2), -t.rung, self._rank_key(t)))
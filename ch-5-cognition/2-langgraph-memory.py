@@ -40,13 +40,17 @@ If you want a *fresh memory* (new thread), change the THREAD_ID variable:
 
 Re-run the script; it will start a blank conversation but keep old ones saved.
 """
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "ch-7-deployment" / "minilab"))
+
 from typing import TypedDict, Annotated
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.sqlite import SqliteSaver
-from langgraph.graph.message import add_messages
+from delta_checkpoint import BatchedSqliteSaver, delta_messages
 from dotenv import load_dotenv
 import os
-from langchain_google_genai import ChatGoogleGenerativeAI
+from llm_factory import make_chat_model
 from langchain_core.messages import HumanMessage
 
 # Load environment variables
@@ -54,14 +58,15 @@ load_dotenv()
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
 # Initialize Gemini model
-llm = ChatGoogleGenerativeAI(
+llm = make_chat_model(
     model="gemini-2.5-flash",
     google_api_key=GOOGLE_API_KEY,
     temperature=0.3,
 )
 
 class ChatState(TypedDict):
-    messages: Annotated[list[HumanMessage], add_messages]
+    # only each turn's new messages are checkpointed (delta_checkpoint.py)
+    messages: Annotated[list[HumanMessage], delta_messages()]
     user_input: str
 
 # ---------- 2. Define nodes ----------
@@ -87,7 +92,7 @@ workflow.add_edge("chat", END)
 
 # ---------- 4. Run with SQLite checkpointer ----------
 if __name__ == "__main__":
-    with SqliteSaver.from_conn_string("checkpoints.db") as checkpointer:
+    with BatchedSqliteSaver.from_conn_string("checkpoints.db") as checkpointer:
         app = workflow.compile(checkpointer=checkpointer)
         THREAD_ID = "thread-3" # modify per user/session
 
@@ -1,11 +1,16 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "ch-7-deployment" / "minilab"))
+
+from llm_factory import make_chat_model
 from langchain_core.messages import HumanMessage
 from dotenv import load_dotenv
 
 load_dotenv()  # ensure GOOGLE_API_KEY is set in .env
 
 # ---- Initialize model ----
-llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.5)
+llm = make_chat_model(model="gemini-2.5-flash", temperature=0.5)
 
 # ---- Stage 1: Generate initial response ----
 prompt = """Summarize the key trends in Artificial Intelligence for 2025. 
@@ -10,13 +10,17 @@ What this does:
    will keep the previous messages/state.
 """
 
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "ch-7-deployment" / "minilab"))
+
 from typing import TypedDict
 from typing_extensions import Annotated
 
 from langgraph.graph import StateGraph, START, END
-from langgraph.graph.message import add_messages
-from langgraph.checkpoint.sqlite import SqliteSaver
-from langchain_google_genai import ChatGoogleGenerativeAI
+from delta_checkpoint import BatchedSqliteSaver, delta_messages
+from llm_factory import make_chat_model
 from langchain_core.messages import HumanMessage
 from dotenv import load_dotenv
 load_dotenv()
@@ -27,11 +31,12 @@ class AgentState(TypedDict):
     plan: str
     result: str
     reflection: str
-    # this lets LangGraph merge messages across nodes & runs
-    messages: Annotated[list[HumanMessage], add_messages]
+    # this lets LangGraph merge messages across nodes & runs; only the new
+    # messages are checkpointed each step (delta_checkpoint.py)
+    messages: Annotated[list[HumanMessage], delta_messages()]
 
 # ---- Initialize model ----
-llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.5)
+llm = make_chat_model(model="gemini-2.5-flash", temperature=0.5)
 
 
 # ----- 2. Nodes -----
@@ -108,7 +113,7 @@ workflow.add_edge("reflection", END)
 # ----- 4. Compile with SQLite checkpointer (for memory) -----
 if __name__ == "__main__":
     # this file will hold the agent's state between runs
-    with SqliteSaver.from_conn_string("chapter5_minilab.db") as checkpointer:
+    with BatchedSqliteSaver.from_conn_string("chapter5_minilab.db") as checkpointer:
         app = workflow.compile(checkpointer=checkpointer)
 
         # you can change this to take input() if you like
@@ -0,0 +1,123 @@
+"""
+Benchmark – checkpoint bytes and latency vs. turn count
+
+Runs the 2-langgraph-memory.py chat graph (user -> chat, no LLM: the reply
+is a fixed-size string) for N turns on one thread and compares:
+- full        : add_messages + SqliteSaver (the original scripts)
+- delta       : delta_messages() + SqliteSaver
+- delta+batch : delta_messages() + BatchedSqliteSaver (WAL, batched commits)
+
+Every turn, the bytes it added to the database (checkpoint + metadata +
+writes blobs) and its latency are recorded. Both are printed as averages
+over windows ending at a few sample turns, so periodic snapshots are
+included at their real share. The file size and the time to load the
+final state with a fresh saver are printed last.
+
+Run:
+    python bench_delta_checkpoint.py            # 500 turns
+    python bench_delta_checkpoint.py 2000 400   # turns, reply chars
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated, TypedDict
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+from delta_checkpoint import BatchedSqliteSaver, delta_messages
+
+# rows are only ever added during the run, so "new since rowid X" is cheap
+NEW_BYTES = {
+    "checkpoints": "SELECT MAX(rowid), SUM(LENGTH(checkpoint) + LENGTH(metadata)) FROM checkpoints WHERE rowid > ?",
+    "writes": "SELECT MAX(rowid), SUM(LENGTH(value)) FROM writes WHERE rowid > ?",
+}
+
+
+def new_bytes(conn, last: dict) -> int:
+    added = 0
+    for table, sql in NEW_BYTES.items():
+        rowid, size = conn.execute(sql, (last[table],)).fetchone()
+        if rowid is not None:
+            last[table] = rowid
+            added += size or 0
+    return added
+
+
+def build(kind: str, reply_chars: int):
+    if kind == "full":
+        class ChatState(TypedDict):
+            messages: Annotated[list, add_messages]
+            user_input: str
+    else:
+        class ChatState(TypedDict):
+            messages: Annotated[list, delta_messages(snapshot_every=50)]
+            user_input: str
+
+    def user_node(state):
+        return {"messages": [HumanMessage(content=state["user_input"])]}
+
+    def chat_node(state):
+        return {"messages": [AIMessage(content=f"turn {len(state['messages'])} " + "x" * reply_chars)]}
+
+    workflow = StateGraph(ChatState)
+    workflow.add_node("user", user_node)
+    workflow.add_node("chat", chat_node)
+    workflow.add_edge(START, "user")
+    workflow.add_edge("user", "chat")
+    workflow.add_edge("chat", END)
+    return workflow
+
+
+def saver_for(kind: str, path: str):
+    if kind == "delta+batch":
+        return BatchedSqliteSaver.from_conn_string(path)
+    return SqliteSaver.from_conn_string(path)
+
+
+def run(kind: str, turns: int, reply_chars: int, samples):
+    path = os.path.join(tempfile.mkdtemp(), f"{kind.replace('+', '_')}.db")
+    workflow = build(kind, reply_chars)
+    config = {"configurable": {"thread_id": "bench"}}
+    rows, window, last = [], [], {"checkpoints": 0, "writes": 0}
+    with saver_for(kind, path) as saver:
+        saver.setup()
+        app = workflow.compile(checkpointer=saver)
+        for turn in range(1, turns + 1):
+            start = time.perf_counter()
+            app.invoke({"messages": [], "user_input": f"question {turn}"}, config)
+            window.append((time.perf_counter() - start, new_bytes(saver.conn, last)))
+            if turn in samples:
+                rows.append((turn, sum(b for _, b in window) / len(window), sum(t for t, _ in window) / len(window)))
+                window = []
+
+    start = time.perf_counter()
+    with SqliteSaver.from_conn_string(path) as saver:
+        state = workflow.compile(checkpointer=saver).get_state(config)
+    load_s = time.perf_counter() - start
+    messages = state.values["messages"]
+    size = sum(f.stat().st_size for f in Path(path).parent.glob(Path(path).name + "*"))
+    return rows, size, load_s, [m.content for m in messages]
+
+
+if __name__ == "__main__":
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    reply_chars = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    samples = {1, 10, 100, turns // 2, turns} & set(range(1, turns + 1))
+
+    reference = None
+    for kind in ("full", "delta", "delta+batch"):
+        start = time.perf_counter()
+        rows, size, load_s, contents = run(kind, turns, reply_chars, samples)
+        wall = time.perf_counter() - start
+        if reference is None:
+            reference = contents
+        print(f"\n{kind:<12} {turns} turns in {wall:.2f}s | db {size / 1e6:.2f} MB | "
+              f"load {load_s * 1e3:.1f} ms | state matches: {contents == reference}")
+        for turn, added, latency in rows:
+            print(f"  up to turn {turn:>5}: {added / 1e3:>8.1f} KB/turn written, {latency * 1e3:6.2f} ms/turn")
@@ -0,0 +1,152 @@
+"""
+Delta Checkpointing – persist only the new messages each turn
+
+With `messages: Annotated[list, add_messages]` and SqliteSaver, every
+checkpoint serializes the WHOLE message list again: turn n writes O(n)
+bytes, a session writes O(n^2), and every put commits (and syncs) on its
+own. This module keeps the same graphs and the same SqliteSaver tables,
+but:
+
+1. delta_messages() / delta_list() declare the history channel as a
+   LangGraph DeltaChannel: a checkpoint stores no value for it, only the
+   node writes of that step (the new messages, which SqliteSaver already
+   keeps in its `writes` table). Loading rebuilds the list from the last
+   full snapshot plus the writes after it, and a full snapshot is written
+   every `snapshot_every` updates to bound that replay
+2. BatchedSqliteSaver opens the database in WAL mode with
+   synchronous=NORMAL and groups puts into one transaction: it commits
+   every `commit_every` writes, or at most `max_delay` seconds after the
+   first uncommitted one, and on close. A crash can lose at most that
+   window (the newest checkpoints); the file always stays consistent
+
+Usage:
+    class ChatState(TypedDict):
+        messages: Annotated[list, delta_messages(snapshot_every=50)]
+
+    with BatchedSqliteSaver.from_conn_string("checkpoints.db") as checkpointer:
+        app = workflow.compile(checkpointer=checkpointer)
+
+Existing databases keep working: a full list stored by the old channel is
+read as the starting snapshot.
+
+Note: DeltaChannel is marked beta in LangGraph (added in 1.2); its on-disk
+format may change between releases, so requirements.txt pins langgraph to
+1.2.x. On a LangGraph without it, delta_messages() / delta_list() fall back
+to the plain reducers (add_messages / list concatenation): same state, full
+checkpoints, and a warning at import.
+"""
+
+import functools
+import operator
+import sqlite3
+import threading
+import warnings
+from contextlib import closing, contextmanager
+from typing import Iterator, List, Optional, Sequence
+
+from langchain_core.messages import RemoveMessage
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.graph.message import add_messages
+
+try:
+    from langgraph.channels import DeltaChannel
+except ImportError:  # langgraph < 1.2
+    DeltaChannel = None
+    warnings.warn("langgraph has no DeltaChannel (needs >= 1.2); checkpointing full message lists")
+
+
+# ----------------------------------------------------
+# 1. Delta channels for growing histories
+# ----------------------------------------------------
+def append_messages(state: list, writes: Sequence) -> list:
+    """Batch reducer: add_messages applied to each write in order.
+
+    add_messages re-indexes the whole list on every call, so plain
+    appends/replacements (the common case) are merged in ONE call; writes
+    with RemoveMessage are folded one by one to keep their exact semantics.
+    """
+    flat = [m for write in writes for m in (write if isinstance(write, list) else [write])]
+    if any(isinstance(m, RemoveMessage) for m in flat):
+        return functools.reduce(add_messages, writes, state)
+    return add_messages(state, flat)
+
+
+def append_items(state: list, writes: Sequence) -> List:
+    """Batch reducer for plain append-only lists (e.g. chat_history strings)."""
+    merged = list(state)
+    for write in writes:
+        merged.extend(write if isinstance(write, list) else [write])
+    return merged
+
+
+def delta_messages(snapshot_every: int = 50):
+    """Drop-in for `add_messages` that checkpoints only new messages."""
+    if DeltaChannel is None:
+        return add_messages
+    return DeltaChannel(append_messages, snapshot_frequency=snapshot_every)
+
+
+def delta_list(snapshot_every: int = 50):
+    """Append-only list channel; nodes return only the NEW items."""
+    if DeltaChannel is None:
+        return operator.add
+    return DeltaChannel(append_items, snapshot_frequency=snapshot_every)
+
+
+# ----------------------------------------------------
+# 2. SqliteSaver with WAL + batched commits
+# ----------------------------------------------------
+class BatchedSqliteSaver(SqliteSaver):
+    def __init__(self, conn: sqlite3.Connection, *, commit_every: int = 32, max_delay: float = 0.2, **kwargs):
+        super().__init__(conn, **kwargs)
+        self.commit_every = commit_every
+        self.max_delay = max_delay
+        self.pending = 0
+        self.commits = 0
+        self._timer: Optional[threading.Timer] = None
+
+    @classmethod
+    @contextmanager
+    def from_conn_string(cls, conn_string: str, *, commit_every: int = 32,
+                         max_delay: float = 0.2) -> Iterator["BatchedSqliteSaver"]:
+        with closing(sqlite3.connect(conn_string, check_same_thread=False)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # WAL: no fsync per commit
+            saver = cls(conn, commit_every=commit_every, max_delay=max_delay)
+            try:
+                yield saver
+            finally:
+                saver.flush()
+
+    @contextmanager
+    def cursor(self, transaction: bool = True) -> Iterator[sqlite3.Cursor]:
+        with self.lock:
+            self.setup()
+            cur = self.conn.cursor()
+            try:
+                yield cur
+            finally:
+                cur.close()
+                if transaction:
+                    self.pending += 1
+                    if self.pending >= self.commit_every:
+                        self._commit()
+                    elif self._timer is None:
+                        self._timer = threading.Timer(self.max_delay, self.flush)
+                        self._timer.daemon = True
+                        self._timer.start()
+
+    def _commit(self) -> None:
+        """Caller holds self.lock."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.pending:
+            self.conn.commit()
+            self.commits += 1
+            self.pending = 0
+
+    def flush(self) -> None:
+        """Commit everything written so far."""
+        with self.lock:
+            self._commit()
@@ -12,8 +12,13 @@ Requires:
 - GOOGLE_API_KEY in a .env file
 """
 
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "ch-7-deployment" / "minilab"))
+
 from langchain_community.vectorstores import FAISS
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
+from llm_factory import make_embeddings
 from langchain_text_splitters.character import RecursiveCharacterTextSplitter
 from dotenv import load_dotenv
 
@@ -34,7 +39,7 @@ chunks = splitter.split_text(' '.join(docs))
 # ----------------------------------------------------
 # 3. Initialize embeddings and create vector store
 # ----------------------------------------------------
-embeddings = GoogleGenerativeAIEmbeddings(model="models/gemini-embedding-001")
+embeddings = make_embeddings(model="models/gemini-embedding-001")
 vectorstore = FAISS.from_texts(chunks, embedding=embeddings)
 
 # ----------------------------------------------------
@@ -12,10 +12,14 @@ Requires:
 - GOOGLE_API_KEY in a .env file
 """
 
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "ch-7-deployment" / "minilab"))
+
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+from llm_factory import make_chat_model, make_embeddings
 from langchain_community.vectorstores import FAISS
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain_text_splitters.character import RecursiveCharacterTextSplitter
 from langgraph.graph import StateGraph, START, END
 from typing import TypedDict
@@ -39,7 +43,7 @@ splitter = RecursiveCharacterTextSplitter(chunk_size=80, chunk_overlap=0)
 chunks = splitter.split_text(" ".join(docs))
 
 # Use Google Generative AI embeddings (can be swapped for other providers)
-embeddings = GoogleGenerativeAIEmbeddings(model="models/gemini-embedding-001")
+embeddings = make_embeddings(model="models/gemini-embedding-001")
 vectorstore = FAISS.from_texts(chunks, embedding=embeddings)
 
 retriever = vectorstore.as_retriever(k=3)
@@ -47,7 +51,7 @@ retriever = vectorstore.as_retriever(k=3)
 # ----------------------------------------------------
 # 3. Initialize Gemini 2.5 Flash as the LLM
 # ----------------------------------------------------
-llm = ChatGoogleGenerativeAI(
+llm = make_chat_model(
     model="gemini-2.5-flash",
     temperature=0.5
 )
@@ -4,20 +4,28 @@ Conversational RAG with Memory (fixed)
 - uses SQLite checkpointer
 """
 
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "ch-7-deployment" / "minilab"))
+sys.path.append(str(Path(__file__).resolve().parent.parent / "ch-5-cognition"))
+
 from dotenv import load_dotenv
 load_dotenv()
 
-from typing import TypedDict
+from typing import Annotated, TypedDict
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.sqlite import SqliteSaver
 
-from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
+from delta_checkpoint import BatchedSqliteSaver, delta_list
+from llm_factory import make_chat_model, make_embeddings
 from langchain_community.vectorstores import FAISS
 
 # ----- 1. state -----
 class ChatState(TypedDict):
     user_input: str
-    chat_history: list[str]
+    # append-only: nodes return just the new lines, and only those are
+    # checkpointed each turn (delta_checkpoint.py)
+    chat_history: Annotated[list[str], delta_list()]
     answer: str
 
 # ----- 2. vector store -----
@@ -27,15 +35,15 @@ docs = [
     "RAG (Retrieval-Augmented Generation) combines retrieval with LLM generation.",
     "Persistent memory helps an AI agent recall previous user interactions."
 ]
-embeddings = GoogleGenerativeAIEmbeddings(model="models/text-embedding-004")
+embeddings = make_embeddings(model="models/text-embedding-004")
 vectorstore = FAISS.from_texts(docs, embedding=embeddings)
 retriever = vectorstore.as_retriever(k=2)
 
 # ----- 3. llm -----
-llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.5)
+llm = make_chat_model(model="gemini-2.5-flash", temperature=0.5)
 
 # ----- 4. node -----
-def rag_with_memory(state: ChatState) -> ChatState:
+def rag_with_memory(state: ChatState) -> dict:
     """Retrieve from FAISS, mix with prior turns, answer with Gemini."""
     query = state["user_input"]
     history_text = "\n".join(state.get("chat_history", []))
@@ -54,14 +62,11 @@ def rag_with_memory(state: ChatState) -> ChatState:
 
     resp = llm.invoke(prompt)
 
-    # update history
-    history = state.get("chat_history", [])
-    history.append(f"User: {query}")
-    history.append(f"AI: {resp.content}")
-
-    state["chat_history"] = history
-    state["answer"] = resp.content
-    return state
+    # return only this turn's lines; the channel appends them to history
+    return {
+        "chat_history": [f"User: {query}", f"AI: {resp.content}"],
+        "answer": resp.content,
+    }
 
 # ----- 5. graph -----
 workflow = StateGraph(ChatState)
@@ -71,7 +76,7 @@ workflow.add_edge("rag_memory", END)
 
 if __name__ == "__main__":
     # use sqlite properly
-    with SqliteSaver.from_conn_string("rag_memory.db") as checkpointer:
+    with BatchedSqliteSaver.from_conn_string("rag_memory.db") as checkpointer:
         app = workflow.compile(checkpointer=checkpointer)
         THREAD_ID = "rag-memory-session-1"
 
@@ -0,0 +1,71 @@
+"""
+Admission Control – bounded in-flight work + bounded wait queue
+
+A plain `def` endpoint runs on Starlette's threadpool (40 threads by
+default), so a pod serves at most ~40 slow LLM calls at once however idle
+its CPU is, and everything beyond that piles up with no limit. With an
+`async def` endpoint and `ainvoke` the event loop can hold hundreds of
+calls; AdmissionLimiter decides how many:
+
+- at most `max_in_flight` requests run at the same time
+- up to `max_queue` more wait (FIFO) for a free slot
+- queue full            -> Rejected(429) immediately
+- waited > queue_timeout -> Rejected(503)
+- `in_flight` / `waiting` are plain attributes, ready for gauges
+
+Usage:
+    limiter = AdmissionLimiter(max_in_flight=256, max_queue=512)
+
+    @app.post("/ask")
+    async def ask(payload):
+        async with limiter:
+            return await llm.ainvoke(payload.question)
+"""
+
+import asyncio
+
+
+class Rejected(Exception):
+    """Raised instead of admitting a request; carries the HTTP status to send."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int = 1):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    def __init__(self, max_in_flight: int = 256, max_queue: int = 512, queue_timeout: float = 10.0):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self._sem = asyncio.Semaphore(max_in_flight)
+
+    async def acquire(self) -> None:
+        if self._sem.locked():
+            if self.waiting >= self.max_queue:
+                raise Rejected(429, "Server busy: request queue is full")
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._sem.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise Rejected(503, "Server busy: timed out waiting for capacity") from None
+            finally:
+                self.waiting -= 1
+        else:
+            await self._sem.acquire()
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._sem.release()
+
+    async def __aenter__(self) -> "AdmissionLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.release()
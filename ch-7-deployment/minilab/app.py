@@ -1,21 +1,145 @@
 # app.py
+import asyncio
+import json
+import logging
 import os
+import threading
+import time
+from contextlib import aclosing, asynccontextmanager
 from dotenv import load_dotenv
-from fastapi import FastAPI
-from pydantic import BaseModel
-from langchain_google_genai import ChatGoogleGenerativeAI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, Field
+from prometheus_client import Counter, Gauge, Histogram, make_asgi_app
+from admission import AdmissionLimiter, Rejected
+from response_cache import RedisStore, ResponseCache, cache_key
 
 # Load environment variables
 load_dotenv()
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
+# Fast start (default): langchain_google_genai (~2/3 of import time, see
+# startup_profile.py) is imported and the client built in a background
+# warmup after the server is up; /ready flips to 200 once that is done.
+# FAST_START=0 builds everything at import time, like before.
+# (LLM_BACKEND=fake serves the offline fake model, see llm_factory.py)
+FAST_START = os.getenv("FAST_START", "1") != "0"
+WARMUP_ATTEMPTS = int(os.getenv("WARMUP_ATTEMPTS", "5"))
+
+logger = logging.getLogger(__name__)
+
+_llm = None
+_llm_lock = threading.Lock()
+_warmup_error = None  # why the background warmup gave up, reported by /ready
+
+def get_llm():
+    """Import + build the Gemini client once (thread-safe)."""
+    global _llm
+    if _llm is None:
+        with _llm_lock:
+            if _llm is None:
+                from llm_factory import make_chat_model  # LLM_BACKEND=fake for offline runs
+                _llm = make_chat_model(
+                    model="gemini-2.5-flash",
+                    api_key=GOOGLE_API_KEY
+                )
+    return _llm
+
+async def aget_llm():
+    """get_llm() without blocking the event loop on a cold first call."""
+    if _llm is not None:
+        return _llm
+    return await asyncio.to_thread(get_llm)
+
+async def warm_up(attempts: int = WARMUP_ATTEMPTS, base_delay: float = 1.0):
+    """Build the client in the background, retrying with exponential backoff."""
+    global _warmup_error
+    for attempt in range(1, attempts + 1):
+        try:
+            await aget_llm()
+            return
+        except Exception as e:
+            logger.warning("LLM warmup attempt %d/%d failed: %s: %s", attempt, attempts, type(e).__name__, e)
+            if attempt == attempts:
+                _warmup_error = f"{type(e).__name__}: {e}"
+                raise
+            await asyncio.sleep(min(30.0, base_delay * 2 ** (attempt - 1)))
+
+def _warmup_done(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        # /ready keeps answering 503 with the error; the next request retries the build
+        logger.error("LLM warmup gave up", exc_info=task.exception())
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup = asyncio.create_task(warm_up()) if FAST_START else None
+    if warmup is not None:
+        warmup.add_done_callback(_warmup_done)
+    yield
+    if warmup is not None:
+        warmup.cancel()
+
+if not FAST_START:
+    get_llm()
+
 # Initialize FastAPI
-app = FastAPI(title="Gemini Agentic API")
+app = FastAPI(title="Gemini Agentic API", lifespan=lifespan)
 
-# Initialize Gemini model 
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",   
-    api_key=GOOGLE_API_KEY
+# Prometheus metrics, scraped from GET /metrics
+app.mount("/metrics", make_asgi_app())
+STREAM_TTFB = Histogram(
+    "ask_stream_ttfb_seconds",
+    "Time from request to the first streamed token",
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 16),
+)
+STREAM_DURATION = Histogram(
+    "ask_stream_duration_seconds",
+    "Total duration of a streamed answer",
+    buckets=(0.5, 1, 2, 4, 8, 16, 32, 64),
+)
+STREAM_REQUESTS = Counter(
+    "ask_stream_requests_total",
+    "Streamed answers by outcome",
+    ["outcome"],  # completed | disconnected | error
+)
+
+# Admission control for /ask, its batch items and /ask/stream: how many LLM calls run / wait at once
+ASK_LIMITER = AdmissionLimiter(
+    max_in_flight=int(os.getenv("ASK_MAX_IN_FLIGHT", "256")),
+    max_queue=int(os.getenv("ASK_MAX_QUEUE", "512")),
+    queue_timeout=float(os.getenv("ASK_QUEUE_TIMEOUT", "10")),
+)
+Gauge("ask_in_flight", "/ask (+ batch items, streams) currently calling the LLM").set_function(
+    lambda: ASK_LIMITER.in_flight
+)
+Gauge("ask_queue_depth", "/ask requests waiting for a free slot").set_function(
+    lambda: ASK_LIMITER.waiting
+)
+ASK_REJECTED = Counter(
+    "ask_rejected_total",
+    "/ask requests rejected because the pod is saturated",
+    ["status"],  # 429 queue full | 503 queue timeout
+)
+
+BATCH_ITEMS = Counter(
+    "ask_batch_items_total",
+    "Questions answered through /ask/batch",
+    ["outcome"],  # ok | error | cancelled (client went away first)
+)
+
+# Response cache for /ask (set ASK_CACHE_REDIS_URL to share it across replicas)
+REDIS_URL = os.getenv("ASK_CACHE_REDIS_URL")
+ASK_CACHE = ResponseCache(
+    ttl=float(os.getenv("ASK_CACHE_TTL", "300")),
+    max_size=int(os.getenv("ASK_CACHE_MAX_SIZE", "10000")),
+    shared=RedisStore(REDIS_URL) if REDIS_URL else None,
+)
+Gauge("ask_cache_hit_ratio", "Share of /ask requests served without a new LLM call").set_function(
+    ASK_CACHE.hit_ratio
+)
+Gauge("ask_cache_saved_seconds", "Upstream LLM latency avoided by cache hits").set_function(
+    lambda: ASK_CACHE.saved_seconds
 )
 
 # Request/response schema
@@ -25,13 +149,164 @@ class AskRequest(BaseModel):
 class AskResponse(BaseModel):
     response: str
 
+BATCH_MAX_SIZE = int(os.getenv("ASK_BATCH_MAX_SIZE", "1000"))
+BATCH_CONCURRENCY = int(os.getenv("ASK_BATCH_CONCURRENCY", "16"))
+
+class BatchRequest(BaseModel):
+    questions: list[str] = Field(min_length=1, max_length=BATCH_MAX_SIZE)
+    max_concurrency: int = Field(BATCH_CONCURRENCY, ge=1, le=BATCH_CONCURRENCY)
+
+@app.exception_handler(Rejected)
+async def rejected_handler(request: Request, exc: Rejected):
+    ASK_REJECTED.labels(str(exc.status_code)).inc()
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 @app.post("/ask", response_model=AskResponse)
-def ask_question(payload: AskRequest):
+async def ask_question(payload: AskRequest):
     """
     Simple agent-style endpoint:
     - Accepts a natural language question
-    - Sends it to Gemini
+    - Sends it to Gemini (async: no threadpool worker is held while waiting)
     - Returns the generated response
+    - Answers 429/503 right away when the pod is saturated
+    - Repeated questions are answered from the cache (one upstream call
+      for identical questions in flight)
+    """
+    return AskResponse(response=await answer(payload.question))
+
+async def answer(question: str) -> str:
+    """Cache -> admission limit -> Gemini; shared by /ask and /ask/batch."""
+    llm = await aget_llm()
+
+    async def call_llm() -> str:
+        async with ASK_LIMITER:
+            result = await llm.ainvoke(question)
+        return result.content
+
+    key = cache_key(question, model=llm.model, temperature=llm.temperature)
+    return await ASK_CACHE.get_or_compute(key, call_llm)
+
+@app.post("/ask/batch")
+async def ask_batch(payload: BatchRequest):
+    """
+    Batch variant of /ask for offline jobs (NDJSON, one line per question):
+    - runs at most `max_concurrency` questions at a time
+    - streams each result as soon as it is ready (completion order), with
+      the question's `index` so the client can reassemble the input order
+    - a failed question becomes `{"index", "error", "status"}`; the rest
+      of the batch keeps going
+    - the last line is a summary: `{"summary": {"total", "succeeded", "failed"}}`
+    """
+    sem = asyncio.Semaphore(payload.max_concurrency)
+
+    async def run_one(index: int, question: str) -> dict:
+        async with sem:
+            try:
+                return {"index": index, "response": await answer(question)}
+            except Rejected as e:
+                ASK_REJECTED.labels(str(e.status_code)).inc()  # same as /ask
+                return {"index": index, "error": e.detail, "status": e.status_code}
+            except Exception as e:
+                logger.exception("/ask/batch question %d failed", index)
+                return {"index": index, "error": str(e), "status": 500}
+
+    async def lines():
+        tasks = [asyncio.ensure_future(run_one(i, q)) for i, q in enumerate(payload.questions)]
+        failed = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                failed += "error" in item
+                BATCH_ITEMS.labels("error" if "error" in item else "ok").inc()
+                yield json.dumps(item) + "\n"
+            total = len(tasks)
+            yield json.dumps({"summary": {"total": total, "succeeded": total - failed, "failed": failed}}) + "\n"
+        finally:
+            for t in tasks:  # client went away: drop questions not answered yet
+                if not t.done():
+                    t.cancel()
+                    BATCH_ITEMS.labels("cancelled").inc()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@app.get("/healthz")
+def liveness():
+    return {"status": "ok"}
+
+@app.get("/ready")
+def readiness():
+    """Readiness probe: 200 only once the LLM client is warm."""
+    if _llm is None:
+        if _warmup_error is not None:
+            return JSONResponse(status_code=503, content={"status": "warmup failed", "error": _warmup_error})
+        return JSONResponse(status_code=503, content={"status": "warming up"})
+    return {"status": "ready"}
+
+@app.get("/cache/stats")
+def cache_stats():
+    return ASK_CACHE.stats()
+
+
+def sse(data: dict, event: str = None) -> str:
+    """Format one server-sent event; JSON keeps newlines in tokens safe."""
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {json.dumps(data)}\n\n"
+
+@app.post("/ask/stream")
+async def ask_question_stream(payload: AskRequest, request: Request):
+    """
+    Streaming variant of /ask (Server-Sent Events):
+    - `data: {"token": ...}` for every chunk as Gemini produces it
+    - `event: done` with the time to first byte, or `event: error`
+    - if the client goes away, the model stream is closed right away,
+      so abandoned requests stop consuming model capacity
+    - admission-controlled like /ask: 429/503 before any byte is sent when
+      the pod is saturated; the slot is held until the stream ends
     """
-    result = llm.invoke(payload.question)
-    return AskResponse(response=result.content)
+    start = time.perf_counter()
+    await ASK_LIMITER.acquire()
+    released = False
+
+    def release():
+        # from the generator's finally, or after the response if it never ran
+        nonlocal released
+        if not released:
+            released = True
+            ASK_LIMITER.release()
+
+    async def events():
+        outcome = "disconnected"  # unless we reach the end (or fail)
+        ttfb = None
+        try:
+            llm = await aget_llm()
+            async with aclosing(llm.astream(payload.question)) as stream:
+                async for chunk in stream:
+                    if await request.is_disconnected():
+                        return
+                    if not chunk.content:
+                        continue
+                    if ttfb is None:
+                        ttfb = time.perf_counter() - start
+                        STREAM_TTFB.observe(ttfb)
+                    yield sse({"token": chunk.content})
+            outcome = "completed"
+            yield sse({"ttfb_ms": round((ttfb or 0) * 1000, 1)}, event="done")
+        except Exception as e:
+            outcome = "error"
+            yield sse({"error": str(e)}, event="error")
+        finally:
+            # also runs when the server cancels us on client disconnect
+            STREAM_REQUESTS.labels(outcome).inc()
+            STREAM_DURATION.observe(time.perf_counter() - start)
+            release()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(release),
+    )
@@ -0,0 +1,267 @@
+"""
+Fake LLM – offline stand-ins for Gemini chat + embeddings
+
+Every graph in the book builds ChatGoogleGenerativeAI directly, so nothing
+can be load-tested or profiled without network access and API spend.
+FakeChatModel / FakeEmbeddings are real LangChain models (invoke, ainvoke,
+stream, astream, batch, embed_documents, ...) that only simulate the
+provider:
+
+- latency drawn from a configurable distribution (see LatencyModel)
+- token-by-token streaming at `tokens_per_second`
+- error injection: `error_rate` of calls raise FakeLLMError
+  (kind = rate_limit / timeout / server_error)
+- deterministic: the same prompt + seed always gives the same answer, and
+  the n-th repeat of a prompt always gets the same latency / error draw
+- usage_metadata with (word-count) token estimates
+
+Select them with LLM_BACKEND=fake through llm_factory.py; or directly:
+
+    llm = FakeChatModel(latency="lognormal:0.8:2.5", tokens_per_second=40)
+    llm.invoke("hello")
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import threading
+import time
+from collections import Counter
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import ConfigDict, Field, PrivateAttr
+
+ERROR_KINDS = ("rate_limit", "timeout", "server_error")
+
+WORDS = (
+    "agents plan tools memory context latency tokens graph state retrieval "
+    "evaluation guardrails model answer market summary reflection step data "
+    "request cache stream batch policy signal result user system response"
+).split()
+
+
+class FakeLLMError(RuntimeError):
+    """Injected provider failure; `kind` says which one."""
+
+    def __init__(self, kind: str):
+        super().__init__(f"fake {kind} error (injected)")
+        self.kind = kind
+
+
+# ----------------------------------------------------
+# 1. Latency distributions
+# ----------------------------------------------------
+class LatencyModel:
+    """Parse + sample a latency spec (seconds).
+
+    "constant:0.5"         always 0.5
+    "uniform:0.2:1.0"      uniform between 0.2 and 1.0
+    "normal:0.8:0.2"       mean 0.8, std 0.2 (clipped at 0)
+    "lognormal:0.8:2.5"    median 0.8, p95 2.5 (long tail, like real APIs)
+    """
+
+    def __init__(self, spec: str = "constant:0"):
+        kind, *params = spec.split(":")
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        if kind == "lognormal":
+            median, p95 = self.params
+            self.mu = math.log(median)
+            self.sigma = math.log(p95 / median) / 1.645 if p95 > median else 0.0
+        elif kind not in ("constant", "uniform", "normal"):
+            raise ValueError(f"unknown latency distribution {kind!r}")
+
+    def sample(self, rng: random.Random) -> float:
+        p = self.params
+        if self.kind == "constant":
+            return p[0]
+        if self.kind == "uniform":
+            return rng.uniform(p[0], p[1])
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(p[0], p[1]))
+        return rng.lognormvariate(self.mu, self.sigma)
+
+    def __repr__(self) -> str:
+        return ":".join([self.kind, *(f"{x:g}" for x in self.params)])
+
+
+def _seed_for(*parts: Any) -> int:
+    return int.from_bytes(hashlib.sha256(repr(parts).encode()).digest()[:8], "big")
+
+
+# ----------------------------------------------------
+# 2. Chat model
+# ----------------------------------------------------
+class FakeChatModel(BaseChatModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model: str = "fake-gemini"
+    temperature: float = 0.0
+    latency: str = "constant:0"  # time to first token, LatencyModel spec
+    tokens_per_second: float = 0.0  # 0 = whole answer at once
+    response_tokens: int = 40
+    responses: Optional[List[str]] = None  # fixed answers, picked per prompt
+    error_rate: float = Field(0.0, ge=0.0, le=1.0)
+    error_kinds: List[str] = list(ERROR_KINDS)
+    seed: int = 0
+
+    _latency: LatencyModel = PrivateAttr()
+    _seen: Counter = PrivateAttr(default_factory=Counter)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._latency = LatencyModel(self.latency)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> dict:
+        # everything that changes the output (used in LangChain cache keys)
+        return {"model": self.model, "temperature": self.temperature, "seed": self.seed,
+                "response_tokens": self.response_tokens, "responses": self.responses}
+
+    # ---------- deterministic plan for one call ----------
+    def _plan(self, messages: List[BaseMessage]):
+        prompt = "\n".join(m.content if isinstance(m.content, str) else str(m.content) for m in messages)
+        with self._lock:
+            self._seen[prompt] += 1
+            occurrence = self._seen[prompt]
+
+        rng = random.Random(_seed_for(self.seed, prompt, occurrence))
+        ttft = self._latency.sample(rng)
+        if rng.random() < self.error_rate:
+            return ttft, None, FakeLLMError(rng.choice(self.error_kinds)), prompt
+
+        text_rng = random.Random(_seed_for(self.seed, prompt))  # same prompt -> same text
+        if self.responses:
+            text = self.responses[text_rng.randrange(len(self.responses))]
+        else:
+            text = " ".join(text_rng.choice(WORDS) for _ in range(self.response_tokens)) + "."
+        tokens = [w + " " for w in text.split(" ")]
+        tokens[-1] = tokens[-1].rstrip()
+        return ttft, tokens, None, prompt
+
+    def _per_token(self) -> float:
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    @staticmethod
+    def _usage(prompt: str, tokens: List[str]) -> dict:
+        n_in, n_out = len(prompt.split()), len(tokens)
+        return {"input_tokens": n_in, "output_tokens": n_out, "total_tokens": n_in + n_out}
+
+    def _result(self, prompt: str, tokens: List[str]) -> ChatResult:
+        message = AIMessage(content="".join(tokens), usage_metadata=self._usage(prompt, tokens))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    # ---------- LangChain hooks ----------
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        ttft, tokens, error, prompt = self._plan(messages)
+        time.sleep(ttft)
+        if error:
+            raise error
+        time.sleep(self._per_token() * len(tokens))
+        return self._result(prompt, tokens)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        ttft, tokens, error, prompt = self._plan(messages)
+        await asyncio.sleep(ttft)
+        if error:
+            raise error
+        await asyncio.sleep(self._per_token() * len(tokens))
+        return self._result(prompt, tokens)
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        ttft, tokens, error, prompt = self._plan(messages)
+        time.sleep(ttft)
+        if error:
+            raise error
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(self._per_token())
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=self._usage(prompt, tokens)))
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        ttft, tokens, error, prompt = self._plan(messages)
+        await asyncio.sleep(ttft)
+        if error:
+            raise error
+        for i, token in enumerate(tokens):
+            if i:
+                await asyncio.sleep(self._per_token())
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=self._usage(prompt, tokens)))
+
+
+# ----------------------------------------------------
+# 3. Embeddings
+# ----------------------------------------------------
+class FakeEmbeddings(Embeddings):
+    """Feature-hashed bag of words: deterministic, and texts sharing words
+    really are close, so FAISS retrieval behaves sensibly offline."""
+
+    def __init__(self, dim: int = 768, latency: str = "constant:0", seed: int = 0):
+        self.dim = dim
+        self.latency = LatencyModel(latency)
+        self.seed = seed
+        self._rng = random.Random(seed)
+
+    def _vector(self, text: str) -> List[float]:
+        vec = [0.0] * self.dim
+        for word in text.lower().split():
+            h = _seed_for(self.seed, word.strip(".,!?;:\"'()"))
+            vec[h % self.dim] += 1.0 if (h >> 32) & 1 else -1.0
+        norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+        return [x / norm for x in vec]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency.sample(self._rng))
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self.latency.sample(self._rng))
+        return [self._vector(t) for t in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
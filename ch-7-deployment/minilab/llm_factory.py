@@ -0,0 +1,258 @@
+"""
+LLM Factory – one place that decides which chat / embedding model to build
+
+Scripts call make_chat_model(...) / make_embeddings(...) with the same
+arguments they used to pass to ChatGoogleGenerativeAI /
+GoogleGenerativeAIEmbeddings. LLM_BACKEND picks the implementation:
+
+    LLM_BACKEND=google (default)  the real Gemini models
+    LLM_BACKEND=fake              fake_llm.FakeChatModel / FakeEmbeddings
+
+Chat models are shared per process: the same arguments reuse one
+underlying model (so its HTTP client and connection pool are reused).
+Each caller gets its own shallow copy of it, so `llm.temperature = t`
+never changes another caller's model. Every call goes through ONE process-wide ProviderRateLimiter (llm_rate_limiter.py)
+that queues callers under the provider's requests/min and tokens/min.
+bind_tools() / with_structured_output() are built by the wrapped model,
+so tool calls and structured output are rate-limited too:
+
+    LLM_RPM=1000                 0 = no request limit
+    LLM_TPM=1000000              0 = no token limit
+    LLM_EXPECTED_OUTPUT_TOKENS=256
+
+Fake backend settings (all optional):
+    FAKE_LLM_LATENCY=lognormal:0.8:2.5   time to first token (LatencyModel spec)
+    FAKE_LLM_TOKENS_PER_SECOND=50        streaming rate (0 = instant)
+    FAKE_LLM_RESPONSE_TOKENS=40
+    FAKE_LLM_ERROR_RATE=0.02
+    FAKE_LLM_SEED=0
+    FAKE_EMBED_LATENCY=constant:0.05
+    FAKE_EMBED_DIM=768
+
+From another chapter:
+    sys.path.append(str(Path(__file__).resolve().parent.parent / "ch-7-deployment" / "minilab"))
+    from llm_factory import make_chat_model
+    llm = make_chat_model(model="gemini-2.5-flash", temperature=0.3)
+"""
+
+import os
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable, RunnableBinding, RunnableParallel, RunnableSequence
+from langchain_core.runnables.fallbacks import RunnableWithFallbacks
+from prometheus_client import Gauge
+from pydantic import ConfigDict
+
+from llm_rate_limiter import ProviderRateLimiter, estimate_tokens
+
+
+def llm_backend() -> str:
+    return os.getenv("LLM_BACKEND", "google").lower()
+
+
+# ----------------------------------------------------
+# 1. Process-wide rate limiter
+# ----------------------------------------------------
+_LIMITER: Optional[ProviderRateLimiter] = None
+_LOCK = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[ProviderRateLimiter]:
+    """The limiter shared by every chat model in this process (None = off)."""
+    global _LIMITER
+    rpm = float(os.getenv("LLM_RPM", "1000"))
+    tpm = float(os.getenv("LLM_TPM", "1000000"))
+    if not rpm and not tpm:
+        return None
+    with _LOCK:
+        if _LIMITER is None:
+            _LIMITER = ProviderRateLimiter(rpm=rpm, tpm=tpm)
+            for budget in ("requests", "tokens"):
+                LIMITER_UTILIZATION.labels(budget).set_function(
+                    lambda b=budget: _LIMITER.utilization()[b]
+                )
+            LIMITER_WAITING.set_function(lambda: _LIMITER.waiting)
+            LIMITER_WAIT_SECONDS.set_function(lambda: _LIMITER.counters["wait_seconds"])
+        return _LIMITER
+
+
+LIMITER_UTILIZATION = Gauge(
+    "llm_rate_limit_utilization",
+    "Share of the provider per-minute budget used over the last 60s",
+    ["budget"],  # requests | tokens
+)
+LIMITER_WAITING = Gauge("llm_rate_limit_waiting", "LLM calls currently queued for budget")
+LIMITER_WAIT_SECONDS = Gauge("llm_rate_limit_wait_seconds", "Total time LLM calls spent queued")
+
+
+# ----------------------------------------------------
+# 2. Rate-limited wrapper around any chat model
+# ----------------------------------------------------
+def _total_tokens(message) -> Optional[int]:
+    usage = getattr(message, "usage_metadata", None)
+    return usage.get("total_tokens") if usage else None
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """Delegates to `inner`, after reserving budget from `limiter`."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: BaseChatModel
+    limiter: Any
+    model: Optional[str] = None
+    temperature: Optional[float] = None
+    expected_output_tokens: int = 256
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # llm.temperature = t: the inner model is shared by every caller with
+        # the same arguments, so swap in a copy of it instead of changing it
+        super().__setattr__(name, value)
+        if name in ("model", "temperature") and "inner" in self.__dict__:
+            super().__setattr__("inner", self.inner.model_copy(update={name: value}))
+
+    @property
+    def _llm_type(self) -> str:
+        return f"rate-limited-{self.inner._llm_type}"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return self.inner._identifying_params
+
+    # Tool calling / structured output: the inner model formats the request
+    # (tool schemas, response schema, parser), the wrapper makes the call.
+    def bind_tools(self, tools, **kwargs: Any) -> Runnable:
+        return self._rebind(self.inner.bind_tools(tools, **kwargs))
+
+    def with_structured_output(self, schema, **kwargs: Any) -> Runnable:
+        return self._rebind(self.inner.with_structured_output(schema, **kwargs))
+
+    def _rebind(self, runnable: Runnable) -> Runnable:
+        """Swap `inner` for this wrapper inside a runnable the inner model built."""
+        if runnable is self.inner:
+            return self
+        if isinstance(runnable, RunnableBinding):
+            return runnable.model_copy(update={"bound": self._rebind(runnable.bound)})
+        if isinstance(runnable, RunnableSequence):
+            return RunnableSequence(*(self._rebind(step) for step in runnable.steps), name=runnable.name)
+        if isinstance(runnable, RunnableParallel):
+            return RunnableParallel({k: self._rebind(step) for k, step in runnable.steps__.items()})
+        if isinstance(runnable, RunnableWithFallbacks):
+            return runnable.model_copy(update={
+                "runnable": self._rebind(runnable.runnable),
+                "fallbacks": [self._rebind(f) for f in runnable.fallbacks],
+            })
+        return runnable
+
+    def _cost(self, messages: List[BaseMessage]) -> int:
+        return estimate_tokens("".join(str(m.content) for m in messages), self.expected_output_tokens)
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        estimate = self.limiter.acquire(self._cost(messages))
+        used = 0  # a failed call gives its token reservation back
+        try:
+            result = self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            used = _total_tokens(result.generations[0].message)
+            return result
+        finally:
+            self.limiter.settle(estimate, used)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        estimate = await self.limiter.aacquire(self._cost(messages))
+        used = 0
+        try:
+            result = await self.inner._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            used = _total_tokens(result.generations[0].message)
+            return result
+        finally:
+            self.limiter.settle(estimate, used)
+
+    def _stream(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        estimate = self.limiter.acquire(self._cost(messages))
+        used = 0
+        try:
+            for chunk in self.inner._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                used = _total_tokens(chunk.message) or used
+                yield chunk
+        finally:
+            self.limiter.settle(estimate, used or None)
+
+    async def _astream(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        estimate = await self.limiter.aacquire(self._cost(messages))
+        used = 0
+        try:
+            async for chunk in self.inner._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                used = _total_tokens(chunk.message) or used
+                yield chunk
+        finally:
+            self.limiter.settle(estimate, used or None)
+
+
+# ----------------------------------------------------
+# 3. Factories
+# ----------------------------------------------------
+_MODELS: Dict[tuple, BaseChatModel] = {}
+
+
+def _build_chat_model(**kwargs):
+    if llm_backend() == "fake":
+        from fake_llm import FakeChatModel
+
+        return FakeChatModel(
+            model=kwargs.get("model", "fake-gemini"),
+            temperature=kwargs.get("temperature", 0.0),
+            latency=os.getenv("FAKE_LLM_LATENCY", "constant:0"),
+            tokens_per_second=float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "0")),
+            response_tokens=int(os.getenv("FAKE_LLM_RESPONSE_TOKENS", "40")),
+            error_rate=float(os.getenv("FAKE_LLM_ERROR_RATE", "0")),
+            seed=int(os.getenv("FAKE_LLM_SEED", "0")),
+        )
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(**kwargs)
+
+
+def make_chat_model(**kwargs):
+    """ChatGoogleGenerativeAI(**kwargs) (or FakeChatModel when
+    LLM_BACKEND=fake), behind the process-wide rate limiter.
+
+    Returns a copy of the shared model: client, limiter and callbacks are
+    shared, settings assigned to it afterwards are not.
+    """
+    key = (llm_backend(), tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
+    with _LOCK:
+        model = _MODELS.get(key)
+    if model is not None:
+        return model.model_copy()
+
+    model = _build_chat_model(**kwargs)
+    limiter = get_rate_limiter()
+    if limiter is not None:
+        model = RateLimitedChatModel(
+            inner=model,
+            limiter=limiter,
+            model=getattr(model, "model", None),
+            temperature=getattr(model, "temperature", None),
+            expected_output_tokens=int(os.getenv("LLM_EXPECTED_OUTPUT_TOKENS", "256")),
+        )
+    with _LOCK:
+        return _MODELS.setdefault(key, model).model_copy()
+
+
+def make_embeddings(**kwargs):
+    """GoogleGenerativeAIEmbeddings(**kwargs), or FakeEmbeddings when LLM_BACKEND=fake."""
+    if llm_backend() == "fake":
+        from fake_llm import FakeEmbeddings
+
+        return FakeEmbeddings(
+            dim=int(os.getenv("FAKE_EMBED_DIM", "768")),
+            latency=os.getenv("FAKE_EMBED_LATENCY", "constant:0"),
+            seed=int(os.getenv("FAKE_LLM_SEED", "0")),
+        )
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+    return GoogleGenerativeAIEmbeddings(**kwargs)
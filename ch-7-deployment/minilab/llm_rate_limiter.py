@@ -0,0 +1,134 @@
+"""
+LLM Rate Limiter – stay under the provider's requests/min AND tokens/min
+
+Without it, a burst of graph runs fires as many Gemini calls as it has
+callers: the provider answers 429, the SDK retries, and the retries burn
+the same quota again. ProviderRateLimiter keeps two token buckets (requests,
+tokens) and makes callers WAIT for budget instead of failing:
+
+- reservation based: each call reserves its cost on arrival and sleeps
+  until the buckets cover it, so callers are served strictly first come,
+  first served (fair; no thundering herd when budget frees up)
+- the token cost is an estimate (prompt chars / 4 + expected output);
+  settle() corrects the bucket with the real usage once the call is done
+- works for threads (acquire) and asyncio (aacquire, never blocks the loop)
+- stats(): rolling 60 s utilization of both budgets, waiters, wait time
+
+Usage:
+    limiter = ProviderRateLimiter(rpm=1000, tpm=1_000_000)
+    estimate = limiter.acquire(estimate_tokens(prompt))
+    ...call the model...
+    limiter.settle(estimate, actual_tokens)
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+
+def estimate_tokens(text: str, expected_output: int = 256) -> int:
+    """Rough prompt + completion estimate (~4 characters per token)."""
+    return len(text) // 4 + expected_output
+
+
+class ProviderRateLimiter:
+    def __init__(self, rpm: float = 1000, tpm: float = 1_000_000, burst_seconds: float = 1.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        # bucket sizes: how much can go out at once after an idle period
+        self._req_cap = max(1.0, rpm / 60 * burst_seconds)
+        self._tok_cap = max(1.0, tpm / 60 * burst_seconds)
+        self._req = self._req_cap  # may go negative = reserved by waiting callers
+        self._tok = self._tok_cap
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+        self._window: deque = deque()  # (time, requests, tokens) of the last 60 s
+        self.waiting = 0
+        self.counters = {"requests": 0, "tokens": 0, "waited": 0, "wait_seconds": 0.0}
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last
+        self._last = now
+        if self.rpm:
+            self._req = min(self._req_cap, self._req + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tok = min(self._tok_cap, self._tok + elapsed * self.tpm / 60)
+
+    def _reserve(self, tokens: int) -> float:
+        """Take the cost now; return how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = 0.0
+            if self.rpm:
+                self._req -= 1
+                wait = max(wait, -self._req / (self.rpm / 60))
+            if self.tpm:
+                self._tok -= tokens
+                wait = max(wait, -self._tok / (self.tpm / 60))
+            self.counters["requests"] += 1
+            self.counters["tokens"] += tokens
+            self._window.append((now, 1, tokens))
+            if wait > 0:
+                self.counters["waited"] += 1
+                self.counters["wait_seconds"] += wait
+            return wait
+
+    def _add_waiter(self, n: int) -> None:
+        with self._lock:
+            self.waiting += n
+
+    def acquire(self, tokens: int = 0) -> int:
+        """Block the calling thread until the request fits the budgets."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            self._add_waiter(1)
+            try:
+                time.sleep(wait)
+            finally:
+                self._add_waiter(-1)
+        return tokens
+
+    async def aacquire(self, tokens: int = 0) -> int:
+        """asyncio version of acquire()."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            self._add_waiter(1)
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._add_waiter(-1)
+        return tokens
+
+    def settle(self, estimated: int, actual: Optional[int]) -> None:
+        """Correct the token bucket once the real usage is known."""
+        if actual is None or not self.tpm:
+            return
+        with self._lock:
+            self._tok += estimated - actual
+            self.counters["tokens"] += actual - estimated
+            self._window.append((time.monotonic(), 0, actual - estimated))
+
+    def utilization(self) -> dict:
+        """Share of each per-minute budget used over the last 60 s."""
+        with self._lock:
+            now = time.monotonic()
+            while self._window and now - self._window[0][0] > 60:
+                self._window.popleft()
+            requests = sum(r for _, r, _ in self._window)
+            tokens = sum(t for _, _, t in self._window)
+        return {
+            "requests": requests / self.rpm if self.rpm else 0.0,
+            "tokens": tokens / self.tpm if self.tpm else 0.0,
+        }
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "wait_seconds": round(self.counters["wait_seconds"], 3),
+            "waiting": self.waiting,
+            "utilization": {k: round(v, 4) for k, v in self.utilization().items()},
+        }
@@ -0,0 +1,279 @@
+"""
+Load Test – drive the agent API at fixed request rates, record the numbers
+
+Runs one or more load steps against /ask or /ask/stream and reports, per
+step: throughput, p50/p95/p99 latency, time to first token (stream),
+error rate by status and, when it started the server itself, server CPU
+utilization (the number the HPA in k8s-deployment.yaml scales on).
+
+- open loop (--rate): requests are sent on a Poisson schedule no matter how
+  slow the server is, and latency is measured from the *scheduled* send
+  time, so a saturated server shows up as growing latency instead of being
+  hidden (no coordinated omission)
+- closed loop (--rate 0): --concurrency workers send back-to-back
+- --spawn starts `uvicorn app:app` with the fake model (LLM_BACKEND=fake,
+  see llm_factory.py), so no API key or network is needed
+- --out saves everything as JSON; --compare prints the change against an
+  earlier run (e.g. the previous version)
+
+Run:
+    python loadtest.py --spawn --rate 20,50,100 --duration 20 --out run.json
+    python loadtest.py --spawn --endpoint stream --rate 50 --compare run.json
+    python loadtest.py --url http://my-pod:8080 --rate 0 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+
+HERE = Path(__file__).resolve().parent
+CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+# ----------------------------------------------------
+# 1. One request
+# ----------------------------------------------------
+async def one_request(client: httpx.AsyncClient, endpoint: str, question: str, scheduled: float) -> dict:
+    """Send one request; times are measured from the scheduled send time."""
+    result = {"status": None, "latency": None, "ttft": None, "lag": time.perf_counter() - scheduled}
+    path = "/ask/stream" if endpoint == "stream" else "/ask"
+    try:
+        async with client.stream("POST", path, json={"question": question}) as resp:
+            result["status"] = resp.status_code
+            if endpoint == "stream" and resp.status_code == 200:
+                async for line in resp.aiter_lines():
+                    if result["ttft"] is None and line.startswith("data:"):
+                        result["ttft"] = time.perf_counter() - scheduled
+                    if line.startswith("event: error"):
+                        result["status"] = "stream_error"
+            else:
+                await resp.aread()
+    except httpx.TimeoutException:
+        result["status"] = "timeout"
+    except httpx.TransportError as e:
+        result["status"] = type(e).__name__
+    result["latency"] = time.perf_counter() - scheduled
+    return result
+
+
+# ----------------------------------------------------
+# 2. One load step (open or closed loop)
+# ----------------------------------------------------
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def _question(i: int, distinct: int) -> str:
+    n = i % distinct if distinct else i
+    return f"Load test question #{n}: summarize the role of an AI agent."
+
+
+def _cpu_seconds(pid: Optional[int]) -> Optional[float]:
+    """utime + stime of a process (Linux /proc), for server CPU utilization."""
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / CLK_TCK
+    except (OSError, IndexError, TypeError):
+        return None
+
+
+async def run_step(url: str, endpoint: str, rate: float, duration: float, concurrency: int,
+                   distinct: int = 0, timeout: float = 60.0, seed: int = 0,
+                   server_pid: Optional[int] = None) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    results: List[dict] = []
+    cpu_before = _cpu_seconds(server_pid)
+
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+        start = time.perf_counter()
+        if rate > 0:
+            rng = random.Random(seed)
+            tasks, t, i = [], 0.0, 0
+            while True:
+                t += rng.expovariate(rate)  # Poisson arrivals
+                if t >= duration:
+                    break
+                delay = start + t - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(one_request(client, endpoint, _question(i, distinct), start + t)))
+                i += 1
+            results = list(await asyncio.gather(*tasks))
+        else:
+            counter = iter(range(10**9))
+
+            async def worker():
+                while time.perf_counter() - start < duration:
+                    results.append(await one_request(
+                        client, endpoint, _question(next(counter), distinct), time.perf_counter()))
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - start
+
+    cpu_after = _cpu_seconds(server_pid)
+    ok = [r for r in results if r["status"] == 200]
+    latencies = [r["latency"] for r in ok]
+    ttfts = [r["ttft"] for r in ok if r["ttft"] is not None]
+    lags = [r["lag"] for r in results]
+    statuses = Counter(str(r["status"]) for r in results)
+    ms = lambda v: round(v * 1000, 1) if v is not None else None  # noqa: E731
+    return {
+        "endpoint": endpoint,
+        "mode": "open" if rate > 0 else "closed",
+        "target_rps": rate,
+        "concurrency": concurrency,
+        "duration_s": round(wall, 2),
+        "requests": len(results),
+        "throughput_rps": round(len(ok) / wall, 2),
+        "error_rate": round(1 - len(ok) / len(results), 4) if results else 0.0,
+        "statuses": dict(statuses),
+        "latency_ms": {f"p{q}": ms(_percentile(latencies, q)) for q in (50, 95, 99)},
+        "ttft_ms": {f"p{q}": ms(_percentile(ttfts, q)) for q in (50, 95, 99)} if endpoint == "stream" else None,
+        # how late the generator itself sent requests; large = results are
+        # limited by this machine, not by the server
+        "client_lag_p99_ms": ms(_percentile(lags, 99)),
+        "server_cpu_util": (
+            round((cpu_after - cpu_before) / wall, 3)
+            if cpu_before is not None and cpu_after is not None else None
+        ),
+    }
+
+
+# ----------------------------------------------------
+# 3. Local server with the fake model
+# ----------------------------------------------------
+def spawn_server(latency: str, tokens_per_second: float, extra_env: Optional[dict] = None):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = {
+        **os.environ,
+        "LLM_BACKEND": "fake",
+        "FAKE_LLM_LATENCY": latency,
+        "FAKE_LLM_TOKENS_PER_SECOND": str(tokens_per_second),
+        "GOOGLE_API_KEY": os.getenv("GOOGLE_API_KEY") or "loadtest",
+        # the fake model has no provider quota: limiter off unless asked for
+        "LLM_RPM": os.getenv("LLM_RPM", "0"),
+        "LLM_TPM": os.getenv("LLM_TPM", "0"),
+        **(extra_env or {}),
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--log-level", "warning"],
+        cwd=HERE, env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url + "/ready", timeout=1).status_code == 200:
+                return proc, url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("server did not become ready within 60s")
+
+
+# ----------------------------------------------------
+# 4. Report / compare
+# ----------------------------------------------------
+def _fmt(value: Optional[float]) -> str:
+    """A percentile, or "-" when the step finished no requests to compute it from."""
+    return "-" if value is None else str(value)
+
+
+def print_step(step: dict) -> None:
+    lat, ttft, lag = step["latency_ms"], step["ttft_ms"], step["client_lag_p99_ms"]
+    line = (f"{step['endpoint']:>6} {step['mode']:>6} rps={step['target_rps'] or step['concurrency']:>6} | "
+            f"{step['throughput_rps']:>7.1f} req/s | "
+            f"p50 {_fmt(lat['p50'])} p95 {_fmt(lat['p95'])} p99 {_fmt(lat['p99'])} ms | "
+            f"err {step['error_rate']:.1%}")
+    if ttft:
+        line += f" | ttft p50 {_fmt(ttft['p50'])} p95 {_fmt(ttft['p95'])} ms"
+    if lag is not None and lag > 100:
+        line += f" | WARNING client lag p99 {lag} ms"
+    if step["server_cpu_util"] is not None:
+        line += f" | cpu {step['server_cpu_util']:.0%}"
+    print(line)
+
+
+def compare(steps: List[dict], baseline_path: str) -> None:
+    baseline = {(s["endpoint"], s["mode"], s["target_rps"], s["concurrency"]): s
+                for s in json.loads(Path(baseline_path).read_text())["steps"]}
+    print(f"\nvs. {baseline_path}:")
+    for s in steps:
+        old = baseline.get((s["endpoint"], s["mode"], s["target_rps"], s["concurrency"]))
+        if old is None:
+            continue
+        deltas = []
+        for q in ("p50", "p95", "p99"):
+            a, b = old["latency_ms"][q], s["latency_ms"][q]
+            if a and b:
+                deltas.append(f"{q} {(b - a) / a:+.1%}")
+        deltas.append(f"throughput {s['throughput_rps'] - old['throughput_rps']:+.1f} req/s")
+        deltas.append(f"errors {s['error_rate'] - old['error_rate']:+.1%}")
+        print(f"  {s['endpoint']} @ {s['target_rps'] or s['concurrency']}: " + ", ".join(deltas))
+
+
+async def main(args) -> None:
+    proc, url = None, args.url
+    if args.spawn:
+        proc, url = spawn_server(args.fake_latency, args.fake_tps)
+    try:
+        steps = []
+        for rate in (float(r) for r in args.rate.split(",")):
+            step = await run_step(url, args.endpoint, rate, args.duration, args.concurrency,
+                                  args.distinct, args.timeout, args.seed, proc.pid if proc else None)
+            print_step(step)
+            steps.append(step)
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+
+    if args.out:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "version": subprocess.run(["git", "describe", "--always", "--dirty"], cwd=HERE,
+                                      capture_output=True, text=True).stdout.strip() or None,
+            "host": {"python": platform.python_version(), "cpus": os.cpu_count()},
+            "config": {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+            "steps": steps,
+        }
+        Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"saved {args.out}")
+    if args.compare:
+        compare(steps, args.compare)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--spawn", action="store_true", help="start app.py locally with the fake model")
+    parser.add_argument("--endpoint", choices=["ask", "stream"], default="ask")
+    parser.add_argument("--rate", default="20", help="requests/s, comma-separated steps; 0 = closed loop")
+    parser.add_argument("--concurrency", type=int, default=256, help="max connections (closed loop: workers)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per step")
+    parser.add_argument("--distinct", type=int, default=0, help="distinct questions (0 = all unique, no cache hits)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fake-latency", default="lognormal:0.8:2.5", help="--spawn: time to first token")
+    parser.add_argument("--fake-tps", type=float, default=50.0, help="--spawn: streamed tokens per second")
+    parser.add_argument("--out", help="save results as JSON")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    asyncio.run(main(parser.parse_args()))
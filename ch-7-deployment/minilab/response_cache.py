@@ -0,0 +1,162 @@
+"""
+Response Cache – single-flight + LRU/TTL cache in front of the LLM call
+
+FAQ-style traffic asks the same question over and over, and /ask pays for
+a full Gemini call every time (often several identical calls at the same
+moment during a spike). ResponseCache:
+
+1. keys on the NORMALIZED question (case, whitespace, trailing punctuation)
+   plus the model parameters, so a model/temperature change never serves
+   stale answers
+2. single-flight: identical questions that arrive while the first one is
+   still running wait for that one upstream call (which keeps running even
+   if the first client disconnects)
+3. a local in-process LRU + TTL store, plus an optional shared store
+   (any object with async get/set, e.g. RedisStore) so all replicas behind
+   the HPA share hits
+4. stats(): hit ratio and the upstream latency that hits saved
+
+Usage:
+    cache = ResponseCache(ttl=300, shared=RedisStore("redis://cache:6379/0"))
+    key = cache_key(question, model="gemini-2.5-flash", temperature=0.7)
+    answer = await cache.get_or_compute(key, lambda: call_llm(question))
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+def normalize_question(question: str) -> str:
+    q = re.sub(r"\s+", " ", question.strip().lower())
+    return q.rstrip(" ?!.")
+
+
+def cache_key(question: str, **params: Any) -> str:
+    raw = json.dumps({"q": normalize_question(question), "p": params}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+# ----------------------------------------------------
+# 1. Storage: local LRU + TTL, optional shared store
+# ----------------------------------------------------
+class MemoryStore:
+    """In-process LRU with per-entry expiry."""
+
+    def __init__(self, max_size: int = 10_000):
+        self.max_size = max_size
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires, value)
+
+    async def get(self, key: str) -> Optional[dict]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+
+class RedisStore:
+    """Shared store for all replicas (needs `pip install redis`)."""
+
+    def __init__(self, url: str, prefix: str = "ask:"):
+        import redis.asyncio as redis  # optional dependency
+
+        self._redis = redis.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[dict]:
+        raw = await self._redis.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        await self._redis.set(self.prefix + key, json.dumps(value), ex=max(1, int(ttl)))
+
+
+# ----------------------------------------------------
+# 2. The cache
+# ----------------------------------------------------
+class ResponseCache:
+    def __init__(self, ttl: float = 300.0, max_size: int = 10_000, shared=None):
+        self.ttl = ttl
+        self.local = MemoryStore(max_size)
+        self.shared = shared
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.counters = dict.fromkeys(["hits", "shared_hits", "coalesced", "misses", "shared_errors"], 0)
+        self.saved_seconds = 0.0
+
+    async def _lookup(self, key: str) -> Optional[dict]:
+        entry = await self.local.get(key)
+        if entry is not None:
+            self.counters["hits"] += 1
+            return entry
+        if self.shared is not None:
+            try:
+                entry = await self.shared.get(key)
+            except Exception:
+                self.counters["shared_errors"] += 1  # a cache outage must not fail requests
+                return None
+            if entry is not None:
+                self.counters["shared_hits"] += 1
+                await self.local.set(key, entry, self.ttl)
+                return entry
+        return None
+
+    async def _compute(self, key: str, fn: Callable[[], Awaitable[str]]) -> dict:
+        start = time.perf_counter()
+        try:
+            value = {"response": await fn(), "latency": time.perf_counter() - start}
+            await self.local.set(key, value, self.ttl)
+            if self.shared is not None:
+                try:
+                    await self.shared.set(key, value, self.ttl)
+                except Exception:
+                    self.counters["shared_errors"] += 1
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def get_or_compute(self, key: str, fn: Callable[[], Awaitable[str]]) -> str:
+        """Return the cached answer for key, or run fn() once for all callers."""
+        entry = await self._lookup(key)
+        if entry is not None:
+            self.saved_seconds += entry["latency"]
+            return entry["response"]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.counters["misses"] += 1
+            task = self._inflight[key] = asyncio.ensure_future(self._compute(key, fn))
+            entry = await asyncio.shield(task)
+        else:
+            self.counters["coalesced"] += 1
+            waited = time.perf_counter()
+            entry = await asyncio.shield(task)
+            self.saved_seconds += max(0.0, entry["latency"] - (time.perf_counter() - waited))
+        return entry["response"]
+
+    def hit_ratio(self) -> float:
+        c = self.counters
+        served = c["hits"] + c["shared_hits"] + c["coalesced"]
+        total = served + c["misses"]
+        return served / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "hit_ratio": round(self.hit_ratio(), 4),
+            "saved_seconds": round(self.saved_seconds, 3),
+            "size": len(self.local._data),
+        }
@@ -0,0 +1,96 @@
+"""
+Startup Profile – where does a new pod spend its time before it is ready?
+
+1. Import-time breakdown: runs `python -X importtime -c "import app"` and
+   sums self time per top-level package (langchain_google_genai,
+   google.genai, fastapi, ...).
+2. Time-to-ready: starts uvicorn the way the container does and polls
+   /healthz (server accepting requests) and /ready (LLM client warm), with
+   FAST_START=1 and FAST_START=0.
+
+Run:
+    python startup_profile.py            # both
+    python startup_profile.py --imports  # breakdown only
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+HERE = Path(__file__).resolve().parent
+
+
+def import_profile(module: str = "app", top: int = 12) -> None:
+    env = {**os.environ, "GOOGLE_API_KEY": os.getenv("GOOGLE_API_KEY") or "profile", "FAST_START": "0"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=HERE, env=env, capture_output=True, text=True, check=True,
+    )
+    per_package = defaultdict(int)
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        package = ".".join(name.split(".")[:2]) if name.startswith(("google.", "langchain")) else name.split(".")[0]
+        per_package[package] += int(self_us)
+        if name == module:
+            total = int(cumulative_us)
+
+    print(f"import {module}: {total / 1e6:.2f}s total (self time by package)")
+    for package, us in sorted(per_package.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"  {package:<32} {us / 1e6:6.2f}s  {us / total:5.1%}")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_to_ready(fast_start: bool, timeout: float = 60.0) -> dict:
+    port = _free_port()
+    env = {**os.environ, "GOOGLE_API_KEY": os.getenv("GOOGLE_API_KEY") or "profile",
+           "FAST_START": "1" if fast_start else "0"}
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--log-level", "warning"],
+        cwd=HERE, env=env,
+    )
+    marks = {}
+    try:
+        while "ready" not in marks and time.perf_counter() - start < timeout:
+            try:
+                if "serving" not in marks:
+                    httpx.get(f"http://127.0.0.1:{port}/healthz", timeout=1)
+                    marks["serving"] = time.perf_counter() - start
+                if httpx.get(f"http://127.0.0.1:{port}/ready", timeout=1).status_code == 200:
+                    marks["ready"] = time.perf_counter() - start
+            except httpx.TransportError:
+                pass
+            time.sleep(0.02)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return marks
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--imports", action="store_true", help="only print the import-time breakdown")
+    args = parser.parse_args()
+
+    import_profile()
+    if not args.imports:
+        print()
+        for fast in (False, True):
+            marks = time_to_ready(fast)
+            print(f"FAST_START={int(fast)}: serving after {marks.get('serving', float('nan')):.2f}s, "
+                  f"ready after {marks.get('ready', float('nan')):.2f}s")